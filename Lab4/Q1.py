@@ -92,26 +92,27 @@ def plot_heuristic_grid(grid, best_path, all_paths, start, goal):
     plt.title("Random Restart Hill Climbing on Heuristic Grid")
     plt.show()
 
-# Parameters
-rows, cols = 10, 10
-goal = (5, 5)  # Peak of the heuristic function
-scale = 2  # Controls the width of the "mountain"
-max_restarts = 5  # Number of random restarts
-
-# Generate heuristic grid
-heuristic_grid = generate_heuristic_grid(rows, cols, peak=goal, scale=scale)
-
-# Print heuristic grid
-print("Heuristic Grid:")
-print(np.round(heuristic_grid, 2))
-
-# Solve using Random Restart Hill Climbing
-best_path, best_position, best_value, all_paths = random_restart_hill_climbing(heuristic_grid, max_restarts)
-
-# Results
-print("\nBest Path Found:", best_path)
-print("Best Final Position:", best_position)
-print("Best Heuristic Value:", best_value)
-
-# Plot the grid and paths
-plot_heuristic_grid(heuristic_grid, best_path, all_paths, start=None, goal=goal)
\ No newline at end of file
+if __name__ == "__main__":
+    # Parameters
+    rows, cols = 10, 10
+    goal = (5, 5)  # Peak of the heuristic function
+    scale = 2  # Controls the width of the "mountain"
+    max_restarts = 5  # Number of random restarts
+
+    # Generate heuristic grid
+    heuristic_grid = generate_heuristic_grid(rows, cols, peak=goal, scale=scale)
+
+    # Print heuristic grid
+    print("Heuristic Grid:")
+    print(np.round(heuristic_grid, 2))
+
+    # Solve using Random Restart Hill Climbing
+    best_path, best_position, best_value, all_paths = random_restart_hill_climbing(heuristic_grid, max_restarts)
+
+    # Results
+    print("\nBest Path Found:", best_path)
+    print("Best Final Position:", best_position)
+    print("Best Heuristic Value:", best_value)
+
+    # Plot the grid and paths
+    plot_heuristic_grid(heuristic_grid, best_path, all_paths, start=None, goal=goal)
\ No newline at end of file
@@ -1,5 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from landscape import rastrigin_landscape
 
 def rastrigin(x):
     A = 10
@@ -46,58 +47,54 @@ def mutation(offspring, mutation_rate, lower_bound, upper_bound):
             offspring[i, mutation_point] = np.clip(offspring[i, mutation_point], lower_bound, upper_bound)
     return offspring
 
-def genetic_algorithm(pop_size, n_dim, lower_bound, upper_bound, generations, crossover_rate, mutation_rate, num_parents):
+def next_generation(population, fitness_vals, crossover_rate, mutation_rate, num_parents, lower_bound, upper_bound):
+    parents = selection(population, fitness_vals, num_parents)
+    offspring = crossover(parents, crossover_rate)
+    offspring = mutation(offspring, mutation_rate, lower_bound, upper_bound)
+    return np.vstack((parents, offspring))[:len(population)]
+
+def genetic_algorithm(pop_size, n_dim, lower_bound, upper_bound, generations, crossover_rate, mutation_rate, num_parents, evaluate=fitness):
     population = initialize_population(pop_size, n_dim, lower_bound, upper_bound)
     best_solution = None
     best_fitness = float('inf')
     
     for generation in range(generations):
-        fitness_vals = fitness(population)
+        fitness_vals = evaluate(population)
         min_fitness_idx = np.argmin(fitness_vals)
         if fitness_vals[min_fitness_idx] < best_fitness:
             best_fitness = fitness_vals[min_fitness_idx]
             best_solution = population[min_fitness_idx]
         
-        parents = selection(population, fitness_vals, num_parents)
-        offspring = crossover(parents, crossover_rate)
-        offspring = mutation(offspring, mutation_rate, lower_bound, upper_bound)
-        
-        population = np.vstack((parents, offspring))[:pop_size]
+        population = next_generation(population, fitness_vals, crossover_rate, mutation_rate, num_parents, lower_bound, upper_bound)
         
         if generation % 50 == 0:
             print(f"Generation {generation}, Best Fitness: {best_fitness}")
     
     return best_solution, best_fitness
 
-pop_size = 50
-n_dim = 2
-lower_bound = -5.12
-upper_bound = 5.12
-generations = 500
-crossover_rate = 0.8
-mutation_rate = 0.1
-num_parents = 20
-
-best_solution, best_fitness = genetic_algorithm(pop_size, n_dim, lower_bound, upper_bound, generations, crossover_rate, mutation_rate, num_parents)
+if __name__ == "__main__":
+    pop_size = 50
+    n_dim = 2
+    lower_bound = -5.12
+    upper_bound = 5.12
+    generations = 500
+    crossover_rate = 0.8
+    mutation_rate = 0.1
+    num_parents = 20
 
-print(f"Best Solution: {best_solution}")
-print(f"Best Fitness: {best_fitness}")
+    best_solution, best_fitness = genetic_algorithm(pop_size, n_dim, lower_bound, upper_bound, generations, crossover_rate, mutation_rate, num_parents)
 
-x = np.linspace(lower_bound, upper_bound, 400)
-y = np.linspace(lower_bound, upper_bound, 400)
-X, Y = np.meshgrid(x, y)
+    print(f"Best Solution: {best_solution}")
+    print(f"Best Fitness: {best_fitness}")
 
-Z = np.zeros(X.shape)
-for i in range(X.shape[0]):
-    for j in range(X.shape[1]):
-        Z[i, j] = rastrigin(np.array([X[i, j], Y[i, j]]))  # Pass a NumPy array here
+    X, Y, Z = rastrigin_landscape(lower_bound, upper_bound, 400, cache_dir=".landscape_cache")
 
-plt.figure(figsize=(10, 8))
-plt.contourf(X, Y, Z, 50, cmap='viridis')
-plt.colorbar(label="Fitness (Rastrigin Function Value)")
-plt.scatter(best_solution[0], best_solution[1], color='red', label='Best Solution')
-plt.title("Genetic Algorithm Optimization on Rastrigin Function")
-plt.xlabel("X-axis")
-plt.ylabel("Y-axis")
-plt.legend()
-plt.show()
\ No newline at end of file
+    plt.figure(figsize=(10, 8))
+    plt.contourf(X, Y, Z, 50, cmap='viridis')
+    plt.colorbar(label="Fitness (Rastrigin Function Value)")
+    plt.scatter(best_solution[0], best_solution[1], color='red', label='Best Solution')
+    plt.title("Genetic Algorithm Optimization on Rastrigin Function")
+    plt.xlabel("X-axis")
+    plt.ylabel("Y-axis")
+    plt.legend()
+    plt.show()
\ No newline at end of file
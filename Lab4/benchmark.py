@@ -0,0 +1,75 @@
+import numpy as np
+
+from optimizers import HillClimbing, RastriginGA, RopeGA, minimize, rope_ga
+
+# Benchmark suite for the ask/tell optimizers in optimizers.py. Every
+# objective takes a (batch, dim) array and returns one value per row; all
+# problems are minimized.
+
+def sphere(X):
+    return np.sum(X**2, axis=1)
+
+def rastrigin(X, A=10):
+    return A * X.shape[1] + np.sum(X**2 - A * np.cos(2 * np.pi * X), axis=1)
+
+def rosenbrock(X):
+    return np.sum(100 * (X[:, 1:] - X[:, :-1]**2)**2 + (1 - X[:, :-1])**2, axis=1)
+
+def negative_rope_strength(X):
+    return -rope_ga.calculate_strength(X)
+
+def make_problems(dim=2):
+    """Standard problems as dicts: name, objective, bounds, dim and target value."""
+    rope_lower = rope_ga.LOWER_BOUNDS
+    rope_upper = rope_ga.UPPER_BOUNDS
+    return [
+        {"name": "sphere", "objective": sphere, "lower": -5.12, "upper": 5.12, "dim": dim, "target": 1e-2},
+        {"name": "rastrigin", "objective": rastrigin, "lower": -5.12, "upper": 5.12, "dim": dim, "target": 1.0},
+        {"name": "rosenbrock", "objective": rosenbrock, "lower": -2.048, "upper": 2.048, "dim": dim, "target": 1e-1},
+        {"name": "rope strength", "objective": negative_rope_strength, "lower": rope_lower, "upper": rope_upper,
+         "dim": len(rope_lower), "target": -0.99 * float(rope_ga.calculate_strength(rope_upper))},
+    ]
+
+OPTIMIZERS = [HillClimbing, RastriginGA, RopeGA]
+
+def run_benchmark(optimizers=OPTIMIZERS, problems=None, max_evaluations=20_000, repeats=5, track_memory=True):
+    """
+    Run every optimizer on every problem `repeats` times with seeds 0..repeats-1.
+
+    Returns:
+        list: One row per (problem, optimizer) with the median evaluations to
+              target (over the runs that reached it), success rate, median
+              best value, mean wall time and peak memory.
+    """
+    problems = problems if problems is not None else make_problems()
+    rows = []
+    for problem in problems:
+        for optimizer_class in optimizers:
+            runs = []
+            for seed in range(repeats):
+                np.random.seed(seed)
+                optimizer = optimizer_class(problem["dim"], problem["lower"], problem["upper"])
+                runs.append(minimize(optimizer, problem["objective"], max_evaluations,
+                                     target=problem["target"], track_memory=track_memory))
+            hits = [r["evaluations_to_target"] for r in runs if r["evaluations_to_target"] is not None]
+            rows.append({
+                "problem": problem["name"],
+                "optimizer": optimizer_class.name,
+                "evaluations_to_target": float(np.median(hits)) if hits else None,
+                "success_rate": len(hits) / repeats,
+                "best_f": float(np.median([r["best_f"] for r in runs])),
+                "wall_time": float(np.mean([r["wall_time"] for r in runs])),
+                "peak_memory": max(r["peak_memory"] for r in runs) if track_memory else None,
+            })
+    return rows
+
+def print_report(rows):
+    print(f"{'Problem':<15}{'Optimizer':<16}{'Evals to target':>16}{'Success':>9}{'Best f':>12}{'Time (s)':>10}{'Peak KiB':>10}")
+    for row in rows:
+        evals = f"{row['evaluations_to_target']:.0f}" if row["evaluations_to_target"] is not None else "-"
+        memory = f"{row['peak_memory'] / 1024:.0f}" if row["peak_memory"] is not None else "-"
+        print(f"{row['problem']:<15}{row['optimizer']:<16}{evals:>16}{row['success_rate']:>9.0%}"
+              f"{row['best_f']:>12.4g}{row['wall_time']:>10.3f}{memory:>10}")
+
+if __name__ == "__main__":
+    print_report(run_benchmark())
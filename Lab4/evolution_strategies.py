@@ -0,0 +1,147 @@
+import numpy as np
+
+from benchmark import make_problems, print_report, rastrigin, run_benchmark
+from optimizers import Optimizer, RastriginGA, minimize
+
+# Vectorized CMA-ES and differential evolution, as faster-converging
+# alternatives to the Rastrigin GA in Q2.py. Both follow the ask/tell
+# interface from optimizers.py and respect the lower/upper box.
+
+class CMAES(Optimizer):
+    """
+    (mu/mu_w, lambda)-CMA-ES with the default strategy parameters from
+    Hansen's tutorial. Samples outside the box are evaluated at the nearest
+    point inside it plus a quadratic penalty on the distance.
+    """
+
+    name = "CMA-ES"
+
+    def __init__(self, dim, lower, upper, sigma=0.3, pop_size=None):
+        super().__init__(dim, lower, upper)
+        n = dim
+        self.lam = pop_size or 4 + int(3 * np.log(n))
+        self.mu = self.lam // 2
+        weights = np.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = weights / weights.sum()
+        self.mueff = 1 / np.sum(self.weights**2)
+
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3)**2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2)**2 + self.mueff))
+        self.damps = 1 + 2 * max(0, np.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n**2))
+
+        self.mean = np.random.uniform(self.lower, self.upper)
+        self.sigma = sigma * float(np.mean(self.upper - self.lower))
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+        self.C = np.eye(n)
+        self.B = np.eye(n)
+        self.D = np.ones(n)
+        self.C_inv_sqrt = np.eye(n)
+        self.generation = 0
+        # Re-decompose C only every few generations; it is O(n^3)
+        self.eigen_interval = max(1, int(1 / ((self.c1 + self.cmu) * n * 10)))
+        self._samples = None
+
+    def ask(self):
+        z = np.random.standard_normal((self.lam, self.dim))
+        self._samples = self.mean + self.sigma * (z * self.D) @ self.B.T
+        return np.clip(self._samples, self.lower, self.upper)
+
+    def penalty(self):
+        """Distance penalty for the samples of the last ask()."""
+        return np.sum((self._samples - np.clip(self._samples, self.lower, self.upper))**2, axis=1)
+
+    def tell(self, candidates, values):
+        super().tell(candidates, values)
+        n = self.dim
+        values = np.asarray(values) + self.penalty()
+        order = np.argsort(values)[:self.mu]
+        x_old = self.mean
+        y = (self._samples[order] - x_old) / self.sigma
+        self.mean = x_old + self.sigma * self.weights @ y
+
+        y_w = self.weights @ y
+        self.ps = (1 - self.cs) * self.ps + np.sqrt(self.cs * (2 - self.cs) * self.mueff) * self.C_inv_sqrt @ y_w
+        self.generation += 1
+        hsig = (np.linalg.norm(self.ps) / np.sqrt(1 - (1 - self.cs)**(2 * self.generation))
+                < (1.4 + 2 / (n + 1)) * self.chi_n)
+        self.pc = (1 - self.cc) * self.pc + hsig * np.sqrt(self.cc * (2 - self.cc) * self.mueff) * y_w
+
+        rank_mu = (y * self.weights[:, np.newaxis]).T @ y
+        self.C = ((1 - self.c1 - self.cmu) * self.C
+                  + self.c1 * (np.outer(self.pc, self.pc) + (1 - hsig) * self.cc * (2 - self.cc) * self.C)
+                  + self.cmu * rank_mu)
+        self.sigma *= np.exp((self.cs / self.damps) * (np.linalg.norm(self.ps) / self.chi_n - 1))
+
+        if self.generation % self.eigen_interval == 0:
+            self.C = np.triu(self.C) + np.triu(self.C, 1).T
+            eigenvalues, self.B = np.linalg.eigh(self.C)
+            self.D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+            self.C_inv_sqrt = (self.B / self.D) @ self.B.T
+
+class DifferentialEvolution(Optimizer):
+    """
+    DE/rand/1/bin. Mutant components that leave the box are placed halfway
+    between the base vector and the violated bound.
+    """
+
+    name = "DE"
+
+    def __init__(self, dim, lower, upper, pop_size=None, F=0.5, CR=0.9):
+        super().__init__(dim, lower, upper)
+        self.pop_size = pop_size or int(np.clip(10 * dim, 20, 200))
+        self.F = F
+        self.CR = CR
+        self.population = np.random.uniform(self.lower, self.upper, (self.pop_size, dim))
+        self.fitness = None
+        self._trials = None
+
+    def ask(self):
+        if self.fitness is None:
+            return self.population
+        n = self.pop_size
+        # Three distinct donors per target, all different from the target itself
+        r = np.argsort(np.random.random((n, n)) + np.eye(n), axis=1)[:, :3]
+        base = self.population[r[:, 0]]
+        mutant = base + self.F * (self.population[r[:, 1]] - self.population[r[:, 2]])
+        mutant = np.where(mutant < self.lower, (base + self.lower) / 2, mutant)
+        mutant = np.where(mutant > self.upper, (base + self.upper) / 2, mutant)
+
+        cross = np.random.random((n, self.dim)) < self.CR
+        cross[np.arange(n), np.random.randint(0, self.dim, n)] = True
+        self._trials = np.where(cross, mutant, self.population)
+        return self._trials
+
+    def tell(self, candidates, values):
+        super().tell(candidates, values)
+        values = np.asarray(values)
+        if self.fitness is None:
+            self.fitness = values
+            return
+        better = values <= self.fitness
+        self.population[better] = candidates[better]
+        self.fitness[better] = values[better]
+
+def _run(optimizer, objective, max_evaluations, target):
+    result = minimize(optimizer, objective, max_evaluations, target=target)
+    print(f"{optimizer.name}: {result['evaluations']} evaluations, Best Fitness: {result['best_f']}")
+    return result["best_x"], result["best_f"]
+
+def cma_es(n_dim, lower_bound, upper_bound, max_evaluations, objective=rastrigin, target=None, **kwargs):
+    """CMA-ES on the Rastrigin function (or `objective`); returns (best_solution, best_fitness)."""
+    return _run(CMAES(n_dim, lower_bound, upper_bound, **kwargs), objective, max_evaluations, target)
+
+def differential_evolution(n_dim, lower_bound, upper_bound, max_evaluations, objective=rastrigin, target=None, **kwargs):
+    """Differential evolution on the Rastrigin function (or `objective`); returns (best_solution, best_fitness)."""
+    return _run(DifferentialEvolution(n_dim, lower_bound, upper_bound, **kwargs), objective, max_evaluations, target)
+
+if __name__ == "__main__":
+    # Evaluations-to-target against the GA on Rastrigin and Sphere at growing dimension
+    for n_dim in (2, 10, 100):
+        problems = [p for p in make_problems(n_dim) if p["name"] in ("rastrigin", "sphere")]
+        print(f"\nDimension {n_dim}")
+        print_report(run_benchmark([RastriginGA, CMAES, DifferentialEvolution], problems,
+                                   max_evaluations=2000 * n_dim, repeats=3, track_memory=False))
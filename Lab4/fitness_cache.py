@@ -0,0 +1,127 @@
+from collections import OrderedDict
+
+import numpy as np
+
+class BudgetExhausted(RuntimeError):
+    """Raised when evaluating the cache misses would exceed the evaluation budget."""
+
+class FitnessCache:
+    """
+    Memoize an expensive fitness function across generations.
+
+    Individuals are keyed by their genome rounded to a multiple of `quantum`,
+    so parents carried over unchanged and children copied without crossover
+    or mutation are looked up instead of re-evaluated. The cache keeps at most
+    `maxsize` entries and evicts the least recently used one when full.
+
+    The instance is called like the fitness function it wraps:
+
+        cache = FitnessCache(fitness, batched=True)
+        genetic_algorithm(..., evaluate=cache)        # Lab4/Q2.py
+        cache = FitnessCache(calculate_strength, batched=True)
+        genetic_algorithm(..., evaluate=cache)        # LabTest/Q2.py
+    """
+
+    def __init__(self, objective, batched=False, quantum=1e-9, maxsize=100_000, budget=None):
+        """
+        Args:
+            objective (callable): The fitness function. With batched=True it is
+                                  called once per population with a
+                                  (n, n_dim) array of cache misses; otherwise
+                                  once per missing individual.
+            batched (bool): Whether `objective` takes a whole batch.
+            quantum (float): Genome values closer than this share a cache entry.
+            maxsize (int): Maximum number of cached individuals.
+            budget (int): Optional cap on real objective evaluations. A call
+                          whose misses would exceed it raises BudgetExhausted
+                          without evaluating anything; see `remaining`.
+        """
+        self.objective = objective
+        self.batched = batched
+        self.quantum = quantum
+        self.maxsize = maxsize
+        self.budget = budget
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evaluations = 0
+        self.evictions = 0
+
+    def _keys(self, population):
+        if not np.all(np.isfinite(population)):
+            raise ValueError("Genomes must be finite to be cached")
+        # Kept as float64: integer keys overflow for values beyond ~9.2e18 * quantum.
+        # Adding 0.0 turns -0.0 into 0.0 so both share an entry.
+        quantized = np.round(population / self.quantum) + 0.0
+        return [row.tobytes() for row in quantized]
+
+    def __call__(self, population):
+        """Return the fitness of every individual, evaluating only cache misses."""
+        population = np.asarray(population, dtype=np.float64)
+        if population.ndim == 1:
+            population = population[np.newaxis, :]
+        keys = self._keys(population)
+        values = np.empty(len(population))
+
+        # Misses are deduplicated so twins in one population cost one evaluation
+        pending = OrderedDict()
+        for i, key in enumerate(keys):
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                values[i] = self._entries[key]
+                self.hits += 1
+            elif key in pending:
+                pending[key].append(i)
+                self.hits += 1
+            else:
+                pending[key] = [i]
+                self.misses += 1
+
+        if pending:
+            if self.budget is not None and self.evaluations + len(pending) > self.budget:
+                raise BudgetExhausted(f"{len(pending)} evaluations needed, {self.remaining} left of {self.budget}")
+            rows = population[[idx[0] for idx in pending.values()]]
+            if self.batched:
+                results = np.asarray(self.objective(rows), dtype=np.float64)
+            else:
+                results = np.array([self.objective(row) for row in rows], dtype=np.float64)
+            self.evaluations += len(rows)
+
+            for (key, idx), value in zip(pending.items(), results):
+                values[idx] = value
+                self._entries[key] = value
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+        return values
+
+    @property
+    def evaluations_saved(self):
+        return self.hits
+
+    @property
+    def remaining(self):
+        if self.budget is None:
+            return None
+        return max(0, self.budget - self.evaluations)
+
+    @property
+    def exhausted(self):
+        return self.budget is not None and self.evaluations >= self.budget
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evaluations": self.evaluations,
+            "evaluations_saved": self.evaluations_saved,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "remaining": self.remaining,
+        }
+
+    def clear(self):
+        self._entries.clear()
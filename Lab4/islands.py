@@ -0,0 +1,189 @@
+import multiprocessing as mp
+import random
+import time
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+
+import numpy as np
+
+def migration_sources(topology, n_islands):
+    """
+    Work out which islands send migrants to each island.
+
+    Args:
+        topology (str or dict): "ring" (island i receives from i-1),
+                                "complete" (from every other island),
+                                "star" (island 0 exchanges with everyone) or
+                                an explicit {island: [source islands]} dict.
+        n_islands (int): Number of islands.
+
+    Returns:
+        list: sources[i] is the list of islands that send to island i.
+    """
+    if isinstance(topology, dict):
+        return [list(topology.get(i, [])) for i in range(n_islands)]
+    if n_islands == 1:
+        return [[]]
+    if topology == "ring":
+        return [[(i - 1) % n_islands] for i in range(n_islands)]
+    if topology == "complete":
+        return [[j for j in range(n_islands) if j != i] for i in range(n_islands)]
+    if topology == "star":
+        return [list(range(1, n_islands))] + [[0] for _ in range(1, n_islands)]
+    raise ValueError(f"Unknown migration topology: {topology}")
+
+def _island_worker(island_id, init_population, evaluate, evolve, island_size, n_dim,
+                   generations, migration_interval, migration_size, sources,
+                   maximize, seed, barrier, emigrants_name, results_name, n_islands):
+    # Forked islands inherit the parent's RNG state, so reseed each one
+    if seed is not None:
+        np.random.seed(seed + island_id)
+        random.seed(seed + island_id)
+    else:
+        np.random.seed()
+        random.seed()
+
+    emigrants_shm = shared_memory.SharedMemory(name=emigrants_name)
+    results_shm = shared_memory.SharedMemory(name=results_name)
+    emigrants = np.ndarray((n_islands, migration_size, n_dim + 1), dtype=np.float64, buffer=emigrants_shm.buf)
+    results = np.ndarray((n_islands, n_dim + 2), dtype=np.float64, buffer=results_shm.buf)
+
+    # Work internally as a minimisation problem
+    sign = -1.0 if maximize else 1.0
+    population = np.asarray(init_population(island_size), dtype=np.float64)
+    best_solution = population[0].copy()
+    best_fitness = float('inf')
+    evaluations = 0
+
+    try:
+        for generation in range(generations):
+            fitness_vals = sign * np.asarray(evaluate(population), dtype=np.float64)
+            evaluations += len(population)
+
+            min_fitness_idx = np.argmin(fitness_vals)
+            if fitness_vals[min_fitness_idx] < best_fitness:
+                best_fitness = fitness_vals[min_fitness_idx]
+                best_solution = population[min_fitness_idx].copy()
+
+            if migration_size and generation > 0 and generation % migration_interval == 0:
+                # Publish our top-k, wait for everyone, then pull from our sources
+                top = np.argsort(fitness_vals)[:migration_size]
+                emigrants[island_id, :, :n_dim] = population[top]
+                emigrants[island_id, :, n_dim] = fitness_vals[top]
+                barrier.wait()
+
+                if sources:
+                    incoming = np.concatenate([emigrants[s] for s in sources])
+                    incoming = incoming[:len(population) - 1]
+                    worst = np.argsort(fitness_vals)[::-1][:len(incoming)]
+                    population[worst] = incoming[:, :n_dim]
+                    fitness_vals[worst] = incoming[:, n_dim]
+                # Nobody may overwrite their slot until all reads are done
+                barrier.wait()
+
+            population = np.asarray(evolve(population, sign * fitness_vals), dtype=np.float64)
+
+        results[island_id, :n_dim] = best_solution
+        results[island_id, n_dim] = best_fitness
+        results[island_id, n_dim + 1] = evaluations
+    except BrokenBarrierError:
+        pass
+    finally:
+        del emigrants, results
+        emigrants_shm.close()
+        results_shm.close()
+
+def island_model(init_population, evaluate, evolve, n_dim, n_islands=4, island_size=50,
+                 generations=200, migration_interval=10, migration_size=2,
+                 topology="ring", maximize=False, seed=None):
+    """
+    Evolve several sub-populations in separate processes with periodic migration.
+
+    Every `migration_interval` generations each island copies its top
+    `migration_size` individuals into a shared-memory buffer and replaces
+    its worst individuals with the migrants published by its sources.
+
+    Args:
+        init_population (callable): init_population(size) -> (size, n_dim) array.
+        evaluate (callable): evaluate(population) -> fitness array.
+        evolve (callable): evolve(population, fitness) -> next population.
+                           All three must be picklable (module-level functions
+                           or functools.partial of them).
+        n_dim (int): Genome length.
+        n_islands (int): Number of islands (one process each).
+        island_size (int): Individuals per island.
+        generations (int): Generations per island.
+        migration_interval (int): Generations between migrations.
+        migration_size (int): Individuals each island sends per migration.
+        topology (str or dict): See migration_sources().
+        maximize (bool): True if higher fitness is better.
+        seed (int): Base seed; island i uses seed + i.
+
+    Returns:
+        tuple: (best_solution, best_fitness, stats) where stats holds the
+               per-island results, total evaluations and wall time.
+    """
+    sources = migration_sources(topology, n_islands)
+    emigrants_shm = shared_memory.SharedMemory(create=True, size=max(1, n_islands * migration_size * (n_dim + 1) * 8))
+    results_shm = shared_memory.SharedMemory(create=True, size=n_islands * (n_dim + 2) * 8)
+    results = np.ndarray((n_islands, n_dim + 2), dtype=np.float64, buffer=results_shm.buf)
+    results[:] = np.nan
+    barrier = mp.Barrier(n_islands)
+
+    start = time.perf_counter()
+    processes = [
+        mp.Process(target=_island_worker, args=(
+            i, init_population, evaluate, evolve, island_size, n_dim, generations,
+            migration_interval, migration_size, sources[i], maximize, seed, barrier,
+            emigrants_shm.name, results_shm.name, n_islands))
+        for i in range(n_islands)
+    ]
+    try:
+        for p in processes:
+            p.start()
+        # A crashed island would leave the others stuck at the barrier
+        while any(p.is_alive() for p in processes):
+            for p in processes:
+                p.join(0.05)
+                if p.exitcode not in (None, 0):
+                    barrier.abort()
+        elapsed = time.perf_counter() - start
+
+        if any(p.exitcode != 0 for p in processes) or np.isnan(results[:, n_dim]).any():
+            raise RuntimeError("An island process failed")
+
+        per_island = results.copy()
+    finally:
+        del results
+        emigrants_shm.close()
+        emigrants_shm.unlink()
+        results_shm.close()
+        results_shm.unlink()
+
+    sign = -1.0 if maximize else 1.0
+    winner = int(np.argmin(per_island[:, n_dim]))
+    evaluations = int(per_island[:, n_dim + 1].sum())
+    stats = {
+        "island_best": sign * per_island[:, n_dim],
+        "evaluations": evaluations,
+        "wall_time": elapsed,
+        "evaluations_per_second": evaluations / elapsed if elapsed > 0 else float('inf'),
+    }
+    return per_island[winner, :n_dim], sign * per_island[winner, n_dim], stats
+
+def measure_scaling(run, core_counts, **kwargs):
+    """
+    Call run(n_islands=cores, **kwargs) with one island per core for each
+    count in `core_counts` (fixed work per island) and report evaluation
+    throughput relative to a single core.
+    """
+    rows = []
+    for cores in core_counts:
+        _, best_fitness, stats = run(n_islands=cores, **kwargs)
+        rows.append((cores, stats["evaluations_per_second"], best_fitness))
+
+    base = rows[0][1] / rows[0][0]
+    for cores, throughput, best_fitness in rows:
+        print(f"Cores={cores}: {throughput:,.0f} evals/s, speedup={throughput / base:.2f}x "
+              f"(ideal {cores}x), Best Fitness={best_fitness:.4f}")
+    return rows
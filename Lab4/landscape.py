@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+A = 10
+
+def rastrigin_mesh(coords):
+    """
+    Evaluate the Rastrigin function on a whole mesh at once.
+
+    Args:
+        coords (sequence of numpy.ndarray): One array per dimension, all
+                                            broadcastable to the same shape
+                                            (e.g. the X, Y from np.meshgrid).
+
+    Returns:
+        numpy.ndarray: Rastrigin value at every mesh point.
+    """
+    total = A * len(coords)
+    for c in coords:
+        total = total + (c**2 - A * np.cos(2 * np.pi * c))
+    return np.asarray(total, dtype=float)
+
+def _cache_path(cache_dir, key):
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"rastrigin_{digest}.npy")
+
+def rastrigin_landscape(lower_bound, upper_bound, resolution, n_dim=2, axes=(0, 1),
+                        fixed=None, chunk_rows=None, cache_dir=None):
+    """
+    Evaluate a 2-D slice of the n_dim Rastrigin landscape in one pass.
+
+    The two dimensions in `axes` are swept over `resolution` points between
+    the bounds; every other dimension is held at the value given in `fixed`
+    (default 0, the global optimum).
+
+    Args:
+        lower_bound, upper_bound (float): Bounds of the swept axes.
+        resolution (int): Number of points along each swept axis.
+        n_dim (int): Dimensionality of the full problem.
+        axes (tuple): The two dimensions to sweep.
+        fixed (dict): Values for the non-swept dimensions, {dim: value}.
+        chunk_rows (int): Evaluate this many mesh rows at a time to bound the
+                          size of the temporaries on big meshes.
+        cache_dir (str): If given, results are stored here keyed by bounds,
+                         resolution and slice, and reloaded on later calls.
+
+    Returns:
+        tuple: (X, Y, Z) arrays of shape (resolution, resolution).
+    """
+    fixed = dict(fixed or {})
+    x = np.linspace(lower_bound, upper_bound, resolution)
+    y = np.linspace(lower_bound, upper_bound, resolution)
+    X, Y = np.meshgrid(x, y)
+
+    path = None
+    if cache_dir is not None:
+        key = {
+            "bounds": [float(lower_bound), float(upper_bound)],
+            "resolution": int(resolution),
+            "n_dim": int(n_dim),
+            "axes": [int(a) for a in axes],
+            "fixed": {str(d): float(v) for d, v in fixed.items()},
+        }
+        path = _cache_path(cache_dir, key)
+        if os.path.exists(path):
+            return X, Y, np.load(path)
+
+    # The held dimensions add the same constant to every mesh point
+    others = [fixed.get(d, 0.0) for d in range(n_dim) if d not in axes]
+    offset = float(rastrigin_mesh([np.float64(v) for v in others])) if others else 0.0
+
+    if chunk_rows is None:
+        Z = rastrigin_mesh([X, Y]) + offset
+    else:
+        Z = np.empty(X.shape)
+        for start in range(0, resolution, chunk_rows):
+            stop = start + chunk_rows
+            Z[start:stop] = rastrigin_mesh([X[start:stop], Y[start:stop]]) + offset
+
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = path + ".tmp.npy"
+        np.save(tmp_path, Z)
+        os.replace(tmp_path, path)
+
+    return X, Y, Z
@@ -0,0 +1,168 @@
+import importlib.util
+import os
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from Q2 import initialize_population, next_generation
+
+# Common ask/tell interface for the lab optimizers. Every optimizer minimizes
+# over a box [lower, upper]:
+#
+#     candidates = optimizer.ask()          # (batch, dim) array
+#     optimizer.tell(candidates, values)    # objective value per row
+#
+# so the objective is always evaluated a whole batch at a time, by the caller.
+
+def _load_rope_ga():
+    # LabTest/Q2.py shares its module name with Lab4/Q2.py, so load it by path
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LabTest", "Q2.py")
+    spec = importlib.util.spec_from_file_location("rope_ga", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+rope_ga = _load_rope_ga()
+
+class Optimizer:
+    """Base class: tracks the best point seen across all tell() calls."""
+
+    name = "optimizer"
+
+    def __init__(self, dim, lower, upper):
+        self.dim = dim
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=float), (dim,))
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=float), (dim,))
+        self.best_x = None
+        self.best_f = float('inf')
+
+    def ask(self):
+        raise NotImplementedError
+
+    def tell(self, candidates, values):
+        best = int(np.argmin(values))
+        if values[best] < self.best_f:
+            self.best_f = float(values[best])
+            self.best_x = np.array(candidates[best])
+
+class HillClimbing(Optimizer):
+    """
+    Random-restart steepest descent, the continuous version of Lab4/Q1.py:
+    each step evaluates the 2*dim axis neighbors of the current point, moves
+    to the best one if it improves, and restarts at a random point otherwise.
+    """
+
+    name = "hill climbing"
+
+    def __init__(self, dim, lower, upper, step=0.05):
+        super().__init__(dim, lower, upper)
+        self.step = step * (self.upper - self.lower)
+        self.current = None
+        self.current_f = float('inf')
+
+    def ask(self):
+        if self.current is None:
+            return np.random.uniform(self.lower, self.upper, (1, self.dim))
+        moves = np.vstack((np.diag(self.step), -np.diag(self.step)))
+        return np.clip(self.current + moves, self.lower, self.upper)
+
+    def tell(self, candidates, values):
+        super().tell(candidates, values)
+        best = int(np.argmin(values))
+        if self.current is None or values[best] < self.current_f:
+            self.current = np.array(candidates[best])
+            self.current_f = float(values[best])
+        else:
+            self.current = None  # local minimum: restart
+
+class RastriginGA(Optimizer):
+    """The Lab4/Q2.py GA: binary tournaments, one-point crossover, Gaussian mutation."""
+
+    name = "GA (Lab4)"
+
+    def __init__(self, dim, lower, upper, pop_size=50, crossover_rate=0.8, mutation_rate=0.1, num_parents=20):
+        super().__init__(dim, lower, upper)
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.num_parents = num_parents
+        self.population = initialize_population(pop_size, dim, self.lower, self.upper)
+
+    def ask(self):
+        return self.population
+
+    def tell(self, candidates, values):
+        super().tell(candidates, values)
+        # mutation() clips to scalar bounds only, so clip per dimension here
+        offspring = next_generation(candidates, values, self.crossover_rate, self.mutation_rate,
+                                    self.num_parents, -np.inf, np.inf)
+        self.population = np.clip(offspring, self.lower, self.upper)
+
+class RopeGA(Optimizer):
+    """The LabTest/Q2.py GA: 3-way tournaments, one-point crossover, uniform reset mutation."""
+
+    name = "GA (LabTest)"
+
+    def __init__(self, dim, lower, upper, pop_size=50, mutation_rate=0.1):
+        super().__init__(dim, lower, upper)
+        self.mutation_rate = mutation_rate
+        self.population = np.random.uniform(self.lower, self.upper, (pop_size, dim))
+
+    def ask(self):
+        return self.population
+
+    def tell(self, candidates, values):
+        super().tell(candidates, values)
+        # The rope GA maximizes its scores
+        self.population = rope_ga.next_generation(candidates, -np.asarray(values), self.mutation_rate,
+                                                  self.lower, self.upper)
+
+def minimize(optimizer, objective, max_evaluations, target=None, seed=None, track_memory=False):
+    """
+    Drive an optimizer until the evaluation budget is spent or `target` is reached.
+
+    Args:
+        optimizer (Optimizer): Any ask/tell optimizer.
+        objective (callable): objective(batch) -> value per row.
+        max_evaluations (int): Evaluation budget.
+        target (float): Stop once the best value is <= target.
+        seed (int): Seeds the global NumPy and random generators.
+        track_memory (bool): Record peak Python/NumPy allocation (slower).
+
+    Returns:
+        dict: best_x, best_f, evaluations, evaluations_to_target (None if the
+              target was not reached), wall_time and peak_memory in bytes.
+    """
+    if seed is not None:
+        np.random.seed(seed)
+        random.seed(seed)
+    if track_memory:
+        tracemalloc.start()
+
+    evaluations = 0
+    evaluations_to_target = None
+    start = time.perf_counter()
+    try:
+        while evaluations < max_evaluations:
+            candidates = optimizer.ask()
+            values = np.asarray(objective(candidates), dtype=float)
+            evaluations += len(candidates)
+            optimizer.tell(candidates, values)
+            if target is not None and optimizer.best_f <= target:
+                evaluations_to_target = evaluations
+                break
+        wall_time = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1] if track_memory else None
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+
+    return {
+        "best_x": optimizer.best_x,
+        "best_f": optimizer.best_f,
+        "evaluations": evaluations,
+        "evaluations_to_target": evaluations_to_target,
+        "wall_time": wall_time,
+        "peak_memory": peak_memory,
+    }
@@ -0,0 +1,24 @@
+import multiprocessing as mp
+from functools import partial
+
+from islands import island_model, measure_scaling
+from Q2 import fitness, initialize_population, next_generation
+
+def rastrigin_island_model(n_dim, lower_bound, upper_bound, crossover_rate=0.8, mutation_rate=0.1,
+                           num_parents=20, **kwargs):
+    """Island model using the Rastrigin GA operators from Q2."""
+    return island_model(
+        partial(initialize_population, n_dim=n_dim, lower_bound=lower_bound, upper_bound=upper_bound),
+        fitness,
+        partial(next_generation, crossover_rate=crossover_rate, mutation_rate=mutation_rate,
+                num_parents=num_parents, lower_bound=lower_bound, upper_bound=upper_bound),
+        n_dim,
+        **kwargs
+    )
+
+if __name__ == "__main__":
+    n_cores = mp.cpu_count()
+    core_counts = sorted({1, 2, 4, n_cores} & set(range(1, n_cores + 1)))
+    measure_scaling(rastrigin_island_model, core_counts, n_dim=10, lower_bound=-5.12,
+                    upper_bound=5.12, island_size=100, num_parents=100, generations=300,
+                    migration_interval=20, migration_size=2, topology="ring", seed=0)
@@ -1,15 +1,26 @@
-import re
+import os
 import json
-from typing import Dict, List
-from phi.agent import Agent
-from phi.model.groq import Groq
+import sys
+import asyncio
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from response_cache import ResponseCache
+from similarity_cache import SimilarityCache
+from async_batch import answer_file
+from cached_agent import CachedAgent
+from keyword_matcher import KeywordMatcher
+from statute_index import StatuteIndex
 
 # Load environment variables
 load_dotenv()
 
-class LegalAgent:
-    def __init__(self):
+class LegalAgent(CachedAgent):
+    out_of_scope_error = "This query appears to be outside the scope of legal information. Please provide a law-related question."
+    failure_prefix = "Error processing legal query"
+
+    def __init__(self, cache: Optional[ResponseCache] = None,
+                 similarity_cache: Optional[SimilarityCache] = None, model=None,
+                 statute_index: Optional[StatuteIndex] = None, top_k: int = 5):
         self.disclaimer = """
         This information is provided for educational purposes only and does not constitute legal advice. 
         Please consult with a qualified attorney for advice specific to your situation.
@@ -31,10 +42,19 @@ class LegalAgent:
         Structure your responses as JSON with explanation, laws, advice, and confidence fields."""
         
         # Initialize Phi agent with Groq and enhanced legal prompt
-        self.agent = Agent(
-            model=Groq(),
-            system_prompt=legal_system_prompt
-        )
+        self.system_prompt = legal_system_prompt
+        # Template for make_agent; each agent runs on its own copy
+        self.model = model
+        self.agent = self.make_agent()
+
+        self.setup_caches(cache, similarity_cache, "legal_response_cache.sqlite3")
+
+        # Local statute/case index (build with statute_index.py) that grounds the prompt
+        index_dir = os.getenv("LEGAL_INDEX_DIR")
+        if statute_index is None and index_dir and os.path.isdir(index_dir):
+            statute_index = StatuteIndex(index_dir)
+        self.statute_index = statute_index
+        self.top_k = top_k
 
         # Expanded legal practice areas with more comprehensive keywords
         self.practice_areas = {
@@ -64,48 +84,75 @@ class LegalAgent:
             ]
         }
 
-    def validate_legal_query(self, query: str) -> bool:
-        """Validate if the query is legal in nature."""
-        # Check if query contains legal keywords or phrases
-        legal_indicators = [
+        # Legal keywords or phrases that mark a query as in scope
+        self.legal_indicators = [
             "law", "legal", "right", "court", "lawyer", "attorney", "lawsuit",
-            "sue", "liability", "contract", "criminal", "civil", "statute"
+            "sue", "liability", "contract", "criminal", "civil", "statute",
+            # Matching is per whole word (plurals aside), so derived forms are listed too
+            "lawful", "unlawful", "lawfully", "unlawfully", "legally", "illegal", "illegally",
+            "sued", "suing", "liable", "contractual", "criminally", "statutory"
         ]
-        query_lower = query.lower()
-        return any(indicator in query_lower for indicator in legal_indicators)
 
-    def preprocess_query(self, query: str) -> str:
-        """Clean and standardize the input query."""
-        query = re.sub(r'[^\w\s]', ' ', query)
-        return ' '.join(query.split()).lower()
+        # Word-boundary keyword automata, built once and matched in a single pass per query
+        self.keyword_matcher = KeywordMatcher(self.practice_areas)
+        self.indicator_matcher = KeywordMatcher({"indicator": self.legal_indicators})
+
+    def validate_legal_query(self, query: str) -> bool:
+        """Validate if the query is legal in nature."""
+        return self.validate_query(query)
 
     def identify_practice_area(self, query: str) -> Dict[str, float]:
         """Identify relevant legal practice areas with confidence scores."""
-        query = self.preprocess_query(query)
-        scores = {}
-        for area, keywords in self.practice_areas.items():
-            matches = sum(1 for kw in keywords if kw in query)
-            total_keywords = len(keywords)
-            scores[area] = matches / total_keywords if matches > 0 else 0
-        return scores
-
-    def generate_response(self, query: str) -> Dict:
-        """Generate response using Phi agent with Groq."""
-        try:
-            # First validate if query is legal in nature
-            if not self.validate_legal_query(query):
-                return {
-                    "error": "This query appears to be outside the scope of legal information. Please provide a law-related question."
-                }
+        return self.keyword_matcher.scores(query)
 
-            # Identify relevant practice areas
-            practice_areas = self.identify_practice_area(query)
-            relevant_areas = [area for area, score in practice_areas.items() if score > 0]
+    def classify_queries(self, queries: List[str]) -> List[Dict[str, float]]:
+        """identify_practice_area for a batch of queries, e.g. a query log."""
+        return self.keyword_matcher.scores_batch(queries)
 
-            # Prepare the enhanced legal prompt
-            prompt = f"""Legal question: {query}
+    def index_fingerprint(self) -> str:
+        """Answers depend on the statute index, so a rebuilt index gets new cache keys."""
+        return self.statute_index.fingerprint if self.statute_index is not None else ""
+
+    def retrieve(self, query: str, relevant_areas: List[str]) -> List[Dict]:
+        """Top-k statute and case passages for the query, filtered by practice area."""
+        if self.statute_index is None:
+            return []
+        return self.statute_index.search(query, self.top_k, relevant_areas)
+
+    def answer_from_summary(self, hit: Dict, relevant_areas: List[str]) -> Dict:
+        """Build the response from a passage's cached structured summary, without the model."""
+        passage = hit["passage"]
+        summary = passage["summary"]
+        return {
+            "answer": summary.get("explanation", passage.get("text", "")),
+            "laws": [{"name": passage.get("name", ""), "citation": passage.get("citation", ""),
+                      "jurisdiction": passage.get("jurisdiction", "")}],
+            "confidence": round(min(1.0, hit["coverage"]), 2),
+            "advice": summary.get("advice", "No specific advice provided"),
+            "jurisdiction_notes": summary.get("jurisdiction_notes", ""),
+            "practice_areas": relevant_areas,
+            "disclaimer": self.disclaimer
+        }
+
+    def local_answer(self, query: str, relevant_areas: List[str]) -> Tuple[Optional[Dict], List[Dict]]:
+        """Answer from a confident match with a cached summary; the hits ground the prompt otherwise."""
+        hits = self.retrieve(query, relevant_areas)
+        if hits and "summary" in hits[0]["passage"] and StatuteIndex.confident(hits):
+            return self.answer_from_summary(hits[0], relevant_areas), hits
+        return None, hits
+
+    def build_prompt(self, query: str, relevant_areas: List[str], hits: List[Dict] = None) -> str:
+        """Prepare the enhanced legal prompt, grounded in retrieved passages if any."""
+        sources = ""
+        if hits:
+            sources = "\n            Sources from the local statute index (cite these where they apply):\n" + "".join(
+                f"            - {h['passage'].get('name', '')} ({h['passage'].get('citation', '')}, "
+                f"{h['passage'].get('jurisdiction', '')}): {h['passage'].get('text', '')[:500]}\n" for h in hits)
+
+        return f"""Legal question: {query}
 
             Relevant practice areas: {', '.join(relevant_areas) if relevant_areas else 'general legal'}
+            {sources}
 
             Provide detailed legal information including:
             1. Relevant laws, statutes, and precedents with citations
@@ -123,41 +170,45 @@ class LegalAgent:
                 "confidence": 0.x,
                 "jurisdiction_notes": "any jurisdiction-specific information"
             }}"""
-            
-            # Get response from Phi agent
-            response = self.agent.run(prompt)
-            
-            # Parse response with enhanced error handling
-            try:
-                if "```json" in response:
-                    data = json.loads(response.split("```json")[1].split("```")[0])
-                else:
-                    data = json.loads(response)
-            except json.JSONDecodeError:
-                # Fallback structure with explanation why parsing failed
-                data = {
-                    "explanation": "Response parsing error. Original response: " + response[:200] + "...",
-                    "laws": [],
-                    "advice": "Unable to parse specific advice from response",
-                    "confidence": 0.5,
-                    "jurisdiction_notes": "Unable to parse jurisdiction information"
-                }
-
-            return {
-                "answer": data.get("explanation", "No explanation provided"),
-                "laws": data.get("laws", []),
-                "confidence": data.get("confidence", 0.5),
-                "advice": data.get("advice", "No specific advice provided"),
-                "jurisdiction_notes": data.get("jurisdiction_notes", ""),
-                "practice_areas": relevant_areas,
-                "disclaimer": self.disclaimer
+
+    def parse_response(self, response: str, relevant_areas: List[str]) -> Tuple[Dict, bool]:
+        """Turn the raw model output into (response dict, parsed); parsed is False on fallback."""
+        parsed = True
+        # Parse response with enhanced error handling
+        try:
+            if "```json" in response:
+                data = json.loads(response.split("```json")[1].split("```")[0])
+            else:
+                data = json.loads(response)
+        except json.JSONDecodeError:
+            # Fallback structure with explanation why parsing failed
+            parsed = False
+            data = {
+                "explanation": "Response parsing error. Original response: " + response[:200] + "...",
+                "laws": [],
+                "advice": "Unable to parse specific advice from response",
+                "confidence": 0.5,
+                "jurisdiction_notes": "Unable to parse jurisdiction information"
             }
 
-        except Exception as e:
-            return {"error": f"Error processing legal query: {str(e)}"}
+        return {
+            "answer": data.get("explanation", "No explanation provided"),
+            "laws": data.get("laws", []),
+            "confidence": data.get("confidence", 0.5),
+            "advice": data.get("advice", "No specific advice provided"),
+            "jurisdiction_notes": data.get("jurisdiction_notes", ""),
+            "practice_areas": relevant_areas,
+            "disclaimer": self.disclaimer
+        }, parsed
 
 def main():
     agent = LegalAgent()
+
+    # Batch mode: python Legal_agent_ai.py queries.txt > answers.jsonl
+    if len(sys.argv) > 1:
+        asyncio.run(answer_file(agent, sys.argv[1]))
+        return
+
     print("Legal Query Assistant (type 'quit' to exit)")
     print("Please note: This tool provides legal information, not legal advice.")
     
@@ -1,15 +1,27 @@
-import re
+import os
 import json
-from typing import Dict, List
-from phi.agent import Agent
-from phi.model.groq import Groq
+import sys
+import asyncio
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from response_cache import ResponseCache
+from similarity_cache import SimilarityCache
+from async_batch import answer_file
+from cached_agent import CachedAgent
+from keyword_matcher import KeywordMatcher
+from movie_index import MovieIndex
 
 # Load environment variables
 load_dotenv()
 
-class MovieAgent:
-    def __init__(self):  # FIXED: Corrected __init__ method
+class MovieAgent(CachedAgent):
+    out_of_scope_error = "This query appears to be outside the scope of movie recommendations. Please provide a movie-related question."
+    failure_prefix = "Error processing movie recommendation query"
+
+    def __init__(self, cache: Optional[ResponseCache] = None,
+                 similarity_cache: Optional[SimilarityCache] = None, model=None,
+                 movie_index: Optional[MovieIndex] = None, shortlist_size: int = 10,
+                 local_threshold: float = 0.6):  # FIXED: Corrected __init__ method
         self.disclaimer = """
         Movie recommendations are subjective and based on available data.
         Ratings and availability may vary by region and platform.
@@ -31,10 +43,12 @@ class MovieAgent:
         Structure your responses as JSON with recommendations, details, and reasoning fields."""
 
         # Initialize Phi agent with Groq and movie recommendation prompt
-        self.agent = Agent(
-            model=Groq(),
-            system_prompt=movie_system_prompt
-        )
+        self.system_prompt = movie_system_prompt
+        # Template for make_agent; each agent runs on its own copy
+        self.model = model
+        self.agent = self.make_agent()
+
+        self.setup_caches(cache, similarity_cache, "movie_response_cache.sqlite3")
 
         # Comprehensive movie categories and keywords
         self.categories = {
@@ -61,47 +75,80 @@ class MovieAgent:
             ]
         }
 
-    def validate_movie_query(self, query: str) -> bool:
-        """Validate if the query is movie-related."""
-        movie_indicators = [
+        # Keywords that mark a query as movie-related
+        self.movie_indicators = [
             "movie", "film", "watch", "cinema", "show", "actor", "director",
-            "genre", "plot", "recommendation", "similar to", "like"
+            "genre", "plot", "recommendation", "similar to", "like",
+            # Matching is per whole word (plurals aside), so derived forms are listed too
+            "watching", "watched", "showing", "filmmaker", "recommend", "recommended"
         ]
-        query_lower = query.lower()
-        return any(indicator in query_lower for indicator in movie_indicators)
 
-    def preprocess_query(self, query: str) -> str:
-        """Clean and standardize the input query."""
-        query = re.sub(r'[^\w\s]', ' ', query)
-        return ' '.join(query.split()).lower()
+        # Word-boundary keyword automata, built once and matched in a single pass per query
+        self.keyword_matcher = KeywordMatcher(self.categories)
+        self.indicator_matcher = KeywordMatcher({"indicator": self.movie_indicators})
+
+        # Local catalog index: candidates for the model to re-rank, or the whole
+        # answer when the best match scores at least local_threshold
+        catalog = os.getenv("MOVIE_CATALOG")
+        if movie_index is None and catalog and os.path.exists(catalog):
+            movie_index = MovieIndex.from_jsonl(catalog, self.categories)
+        self.movie_index = movie_index
+        self.shortlist_size = shortlist_size
+        self.local_threshold = local_threshold
+
+    def validate_movie_query(self, query: str) -> bool:
+        """Validate if the query is movie-related."""
+        return self.validate_query(query)
 
     def identify_preferences(self, query: str) -> Dict[str, float]:
         """Identify relevant movie preferences with confidence scores."""
-        query = self.preprocess_query(query)
-        scores = {}
-        for category, keywords in self.categories.items():
-            matches = sum(1 for kw in keywords if kw in query)
-            total_keywords = len(keywords)
-            scores[category] = matches / total_keywords if matches > 0 else 0
-        return scores
-
-    def generate_response(self, query: str) -> Dict:
-        """Generate movie recommendations using Phi agent with Groq."""
-        try:
-            # First validate if query is movie-related
-            if not self.validate_movie_query(query):
-                return {
-                    "error": "This query appears to be outside the scope of movie recommendations. Please provide a movie-related question."
-                }
+        return self.keyword_matcher.scores(query)
+
+    def classify_queries(self, queries: List[str]) -> List[Dict[str, float]]:
+        """identify_preferences for a batch of queries, e.g. a query log."""
+        return self.keyword_matcher.scores_batch(queries)
+
+    def index_fingerprint(self) -> str:
+        """Answers depend on the movie catalog, so a changed catalog gets new cache keys."""
+        return self.movie_index.fingerprint if self.movie_index is not None else ""
+
+    def shortlist(self, query: str) -> List[Dict]:
+        """Best matching catalog movies, prefiltered by the query's categories."""
+        if self.movie_index is None:
+            return []
+        return self.movie_index.search(query, self.shortlist_size)
+
+    def answer_locally(self, query: str, candidates: List[Dict], relevant_categories: List[str]) -> Dict:
+        """Build the response from the catalog shortlist, without the model."""
+        matched = [kw for keywords in self.keyword_matcher.matches(query).values() for kw in keywords]
+        return {
+            "recommendations": candidates[:5],
+            "reasoning": "Matched in the local catalog on: " + (", ".join(matched) if matched else "description"),
+            "confidence": round(candidates[0]["score"], 2),
+            "alternative_suggestions": [movie["title"] for movie in candidates[5:]],
+            "categories": relevant_categories,
+            "disclaimer": self.disclaimer
+        }
 
-            # Identify relevant preferences
-            preferences = self.identify_preferences(query)
-            relevant_categories = [cat for cat, score in preferences.items() if score > 0]
+    def local_answer(self, query: str, relevant_categories: List[str]) -> Tuple[Optional[Dict], List[Dict]]:
+        """Answer from a strong catalog match; the shortlist restricts the prompt otherwise."""
+        candidates = self.shortlist(query)
+        if candidates and candidates[0]["score"] >= self.local_threshold:
+            return self.answer_locally(query, candidates, relevant_categories), candidates
+        return None, candidates
 
-            # Prepare the enhanced movie recommendation prompt
-            prompt = f"""Movie recommendation request: {query}
+    def build_prompt(self, query: str, relevant_categories: List[str], candidates: List[Dict] = None) -> str:
+        """Prepare the enhanced movie recommendation prompt, restricted to a shortlist if given."""
+        shortlist = ""
+        if candidates:
+            shortlist = "\n            Re-rank and annotate only these candidates from the local catalog:\n" + "".join(
+                f"            - {movie['title']} ({movie['year']}, {movie['director']}): {', '.join(movie['genre'])}\n"
+                for movie in candidates)
+
+        return f"""Movie recommendation request: {query}
 
             Relevant categories: {', '.join(relevant_categories) if relevant_categories else 'general movies'}
+            {shortlist}
 
             Provide detailed movie recommendations including:
             1. Movie titles with year and director
@@ -128,36 +175,40 @@ class MovieAgent:
                 "confidence": 0.x,
                 "alternative_suggestions": ["movie1", "movie2"]
             }}"""
-            
-            # Get response from Phi agent
-            response = self.agent.run(prompt)
-
-            # FIXED: Parse response safely
-            try:
-                data = json.loads(response)
-            except json.JSONDecodeError:
-                data = {
-                    "recommendations": [],
-                    "reasoning": "Response parsing error. Original response: " + response[:200] + "...",
-                    "confidence": 0.5,
-                    "alternative_suggestions": []
-                }
-
-            return {
-                "recommendations": data.get("recommendations", []),
-                "reasoning": data.get("reasoning", "No explanation provided"),
-                "confidence": data.get("confidence", 0.5),
-                "alternative_suggestions": data.get("alternative_suggestions", []),
-                "categories": relevant_categories,
-                "disclaimer": self.disclaimer
+
+    def parse_response(self, response: str, relevant_categories: List[str]) -> Tuple[Dict, bool]:
+        """Turn the raw model output into (response dict, parsed); parsed is False on fallback."""
+        parsed = True
+        # FIXED: Parse response safely
+        try:
+            data = json.loads(response)
+        except json.JSONDecodeError:
+            parsed = False
+            data = {
+                "recommendations": [],
+                "reasoning": "Response parsing error. Original response: " + response[:200] + "...",
+                "confidence": 0.5,
+                "alternative_suggestions": []
             }
 
-        except Exception as e:
-            return {"error": f"Error processing movie recommendation query: {str(e)}"}
+        return {
+            "recommendations": data.get("recommendations", []),
+            "reasoning": data.get("reasoning", "No explanation provided"),
+            "confidence": data.get("confidence", 0.5),
+            "alternative_suggestions": data.get("alternative_suggestions", []),
+            "categories": relevant_categories,
+            "disclaimer": self.disclaimer
+        }, parsed
 
 # FIXED: Proper indentation for main()
 def main():
     agent = MovieAgent()
+
+    # Batch mode: python Q3.py queries.txt > answers.jsonl
+    if len(sys.argv) > 1:
+        asyncio.run(answer_file(agent, sys.argv[1]))
+        return
+
     print("Movie Recommendation Assistant (type 'quit' to exit)")
     print("Please describe what kind of movie you're looking for!")
 
@@ -1,8 +1,15 @@
+import bisect
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import json
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import threading
+from recipe_cache import RecipeCache
+from recipe_index import RecipeIndex
 from phi.agent import Agent
 from phi.model.openai import OpenAIChat
 from dotenv import load_dotenv
@@ -26,12 +33,21 @@ class RecipeAgent:
         self.setup_ingredient_parser()
         self.setup_cuisines()
         self.setup_dietary_preferences()
+        self.setup_local_index()
+
+    def setup_local_index(self, corpus_path: str = None):
+        # Optional offline corpus (JSONL of get_recipe_details responses), searched before the API
+        corpus_path = corpus_path or os.getenv("RECIPE_CORPUS")
+        self.local_index = None
+        if corpus_path and os.path.exists(corpus_path):
+            self.local_index = RecipeIndex.from_jsonl(corpus_path, self.cuisines, self.dietary_options)
+            logging.info(f"Loaded {len(self.local_index)} recipes from {corpus_path}")
 
     def setup_apis(self):
         self.openai_key = os.getenv("OPENAI_API_KEY")  # Fixed environment variable name
         self.model_name = "gpt-3.5-turbo"
         self.spoonacular_key = os.getenv("SPOONACULAR_API_KEY")
-        self.spoonacular_base_url = "https://api.spoonacular.com/recipes"
+        self.spoonacular_base_url = os.getenv("SPOONACULAR_BASE_URL", "https://api.spoonacular.com/recipes")
 
         if not self.openai_key or not self.spoonacular_key:
             raise ValueError("Missing required API keys in .env file")
@@ -43,6 +59,66 @@ class RecipeAgent:
             logging.error(f"Error initializing GPT agent: {e}")
             self.gpt_agent = None
 
+        self.setup_session()
+        self.setup_cache()
+
+    def setup_cache(self, path: str = "recipe_cache.sqlite3", search_ttl: float = 3600,
+                    details_ttl: float = 7 * 24 * 3600, offline: bool = False):
+        # Searches go stale faster than recipe details; offline serves only from the cache
+        self.cache = RecipeCache(path)
+        self.search_ttl = search_ttl
+        self.details_ttl = details_ttl
+        self.offline = offline or os.getenv("RECIPE_OFFLINE") == "1"
+
+    def cached_get(self, key: str, url: str, params: Dict, ttl: float):
+        """
+        GET through the cache: fresh entries are served directly, expired ones
+        are revalidated with If-None-Match/If-Modified-Since, and any entry is
+        served stale if the API cannot be reached (or offline mode is on).
+        """
+        entry = self.cache.get(key)
+        if entry is not None and (entry["age"] < ttl or self.offline):
+            self.cache.hits += 1
+            return entry["value"]
+        if self.offline:
+            self.cache.misses += 1
+            raise requests.ConnectionError(f"Offline and not cached: {key}")
+
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = self.session.get(url, params=params, headers=headers, timeout=15)
+            if response.status_code == 304 and entry is not None:
+                self.cache.touch(key)
+                self.cache.revalidated += 1
+                return entry["value"]
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as e:
+            if entry is None:
+                self.cache.misses += 1
+                raise
+            logging.warning(f"Serving stale {key}: {e}")
+            self.cache.stale_served += 1
+            return entry["value"]
+
+        self.cache.misses += 1
+        self.cache.put(key, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return data
+
+    def setup_session(self, pool_size: int = 8):
+        # One keep-alive connection pool shared by every API call
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.detail_workers = pool_size
+        self.bulk_supported = True
+
     def setup_cuisines(self):
         self.cuisines = {
             "Indian": ["Biryani", "Curry", "Tandoori", "Dosa"],
@@ -72,6 +148,19 @@ class RecipeAgent:
         return [ing.strip() for ing in text.split(',') if ing.strip()]
 
     def search_recipes(self, query: str = None, ingredients: List[str] = None, cuisine: str = None, diet: str = None) -> List[Dict]:
+        if self.local_index is not None:
+            results = self.local_index.search(query=query, ingredients=ingredients, cuisine=cuisine, diet=diet)
+            if results:
+                # Corpus entries are full details: cache them so the details step makes no request
+                for recipe in results:
+                    if "id" not in recipe:
+                        continue
+                    key = RecipeCache.recipe_key(recipe["id"])
+                    if self.cache.get(key) is None:
+                        details = {k: v for k, v in recipe.items()
+                                   if k not in ("usedIngredientCount", "missedIngredientCount")}
+                        self.cache.put(key, details)
+                return results
         try:
             params = {
                 "apiKey": self.spoonacular_key,
@@ -90,9 +179,8 @@ class RecipeAgent:
             if diet:
                 params["diet"] = diet
 
-            response = requests.get(f"{self.spoonacular_base_url}/complexSearch", params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
+            data = self.cached_get(RecipeCache.search_key(params), f"{self.spoonacular_base_url}/complexSearch",
+                                   params, self.search_ttl)
 
             return data.get("results", [])
         except requests.RequestException as e:
@@ -102,25 +190,95 @@ class RecipeAgent:
     def get_recipe_details(self, recipe_id: int) -> Dict:
         try:
             params = {"apiKey": self.spoonacular_key}
-            response = requests.get(
+            return self.cached_get(
+                RecipeCache.recipe_key(recipe_id),
                 f"{self.spoonacular_base_url}/{recipe_id}/information",
-                params=params,
-                timeout=15
+                params,
+                self.details_ttl
             )
-            response.raise_for_status()
-            return response.json()
         except requests.RequestException as e:
             logging.error(f"Details error for {recipe_id}: {e}")
             return {}
 
+    def get_recipes_bulk(self, recipe_ids: List[int]) -> Optional[List[Dict]]:
+        """Fetch several recipes in one informationBulk call; None if the endpoint is unavailable."""
+        try:
+            params = {"apiKey": self.spoonacular_key, "ids": ",".join(str(i) for i in recipe_ids)}
+            response = self.session.get(f"{self.spoonacular_base_url}/informationBulk", params=params, timeout=15)
+            if response.status_code in (404, 405, 501):
+                # Not offered by this server: stop trying it
+                self.bulk_supported = False
+                return None
+            response.raise_for_status()
+            recipes = {recipe.get("id"): recipe for recipe in response.json()}
+            for recipe_id, recipe in recipes.items():
+                self.cache.put(RecipeCache.recipe_key(recipe_id), recipe)
+            return [recipes.get(recipe_id, {}) for recipe_id in recipe_ids]
+        except (requests.RequestException, ValueError) as e:
+            logging.error(f"Bulk details error for {recipe_ids}: {e}")
+            return None
+
+    def iter_recipes_details(self, recipe_ids: List[int], cancel: threading.Event = None) -> Iterator[Tuple[int, Dict]]:
+        """
+        Yield (position, details) for every id as soon as each is available.
+        Fresh cached recipes come first; the rest come from one bulk call if
+        possible, else from concurrent single fetches. Setting `cancel` stops
+        the remaining fetches.
+        """
+        missing = []
+        for position, recipe_id in enumerate(recipe_ids):
+            entry = self.cache.get(RecipeCache.recipe_key(recipe_id))
+            if entry is not None and entry["age"] < self.details_ttl:
+                self.cache.hits += 1
+                yield position, entry["value"]
+            else:
+                missing.append(position)
+        if not missing or (cancel is not None and cancel.is_set()):
+            return
+
+        if self.bulk_supported and not self.offline:
+            fetched = self.get_recipes_bulk([recipe_ids[position] for position in missing])
+            if fetched is not None:
+                self.cache.misses += len(missing)
+                yield from zip(missing, fetched)
+                return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.detail_workers, len(missing)))
+        try:
+            futures = {executor.submit(self.get_recipe_details, recipe_ids[position]): position for position in missing}
+            for future in as_completed(futures):
+                if cancel is not None and cancel.is_set():
+                    return
+                yield futures[future], future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_recipes_details(self, recipe_ids: List[int]) -> List[Dict]:
+        """Details for every id, in order."""
+        recipes = [{}] * len(recipe_ids)
+        for position, recipe in self.iter_recipes_details(recipe_ids):
+            recipes[position] = recipe
+        return recipes
+
 class RecipeGUI:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Recipe Master 2.0")
         self.root.geometry("1200x800")
         self.agent = RecipeAgent()
-        self.current_recipes = []
+        self.current_recipes = []     # in search order
+        self.current_positions = []   # search position of each entry of current_recipes
+
+        # Network calls run on a worker thread; the Tk thread only renders
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.updates = queue.Queue()
+        self.search_id = 0
+        self.expected = 0
+        self.cancel_search = threading.Event()
+
         self.setup_gui()
+        self.root.after(50, self.process_updates)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
 
     def setup_gui(self):
         self.notebook = ttk.Notebook(self.root)
@@ -134,49 +292,122 @@ class RecipeGUI:
 
         self.search_entry = ttk.Entry(search_frame, width=60)
         self.search_entry.pack(fill=tk.X, padx=5, pady=5)
+        self.search_entry.bind("<Return>", lambda event: self.execute_search())
 
         ttk.Button(search_frame, text="Search Recipes", command=self.execute_search).pack(pady=5)
 
+        self.status = ttk.Label(search_frame, text="")
+        self.status.pack(fill=tk.X, padx=5)
+
         self.results_area = scrolledtext.ScrolledText(search_frame, wrap=tk.WORD)
+        self.results_area.tag_configure("title", font=("TkDefaultFont", 12, "bold"))
+        self.results_area.tag_configure("subheader", font=("TkDefaultFont", 10, "bold"))
         self.results_area.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
     def execute_search(self):
         query = self.search_entry.get().strip()
 
+        # Cancel the previous search; its late results are dropped by search id
+        self.cancel_search.set()
+        self.cancel_search = threading.Event()
+        self.search_id += 1
+        self.clear_results()
+        self.status.config(text="Searching...")
+        self.executor.submit(self.search_worker, self.search_id, query, self.cancel_search)
+
+    def search_worker(self, search_id: int, query: str, cancel: threading.Event):
         try:
             results = self.agent.search_recipes(query=query)
-            self.current_recipes = [self.agent.get_recipe_details(recipe['id']) for recipe in results if 'id' in recipe]
-
-            self.display_results(self.current_recipes)
+            recipe_ids = [recipe['id'] for recipe in results if 'id' in recipe]
+            self.updates.put((search_id, "found", len(recipe_ids)))
+            for position, recipe in self.agent.iter_recipes_details(recipe_ids, cancel):
+                if cancel.is_set():
+                    return
+                self.updates.put((search_id, "recipe", (position, recipe)))
+            self.updates.put((search_id, "done", None))
         except Exception as e:
-            messagebox.showerror("Search Error", str(e))
+            logging.error(f"Search error: {e}")
+            self.updates.put((search_id, "error", str(e)))
 
-    def display_results(self, recipes: List[Dict]):
+    def process_updates(self):
+        # Runs on the Tk thread: drain what the workers produced, then reschedule
+        try:
+            while True:
+                search_id, kind, payload = self.updates.get_nowait()
+                if search_id != self.search_id:
+                    continue
+                if kind == "found":
+                    self.expected = payload
+                    self.status.config(text=f"Found {payload} recipes, loading details...")
+                elif kind == "recipe":
+                    self.add_recipe(*payload)
+                    self.status.config(text=f"Loaded {len(self.current_recipes)} of {self.expected} recipes")
+                elif kind == "done":
+                    self.status.config(text=f"{len(self.current_recipes)} recipes")
+                elif kind == "error":
+                    self.status.config(text="")
+                    messagebox.showerror("Search Error", payload)
+        except queue.Empty:
+            pass
+        self.root.after(50, self.process_updates)
+
+    def clear_results(self):
+        self.current_recipes = []
+        self.current_positions = []
         self.results_area.config(state=tk.NORMAL)
         self.results_area.delete(1.0, tk.END)
+        for mark in self.results_area.mark_names():
+            if mark.startswith("recipe"):
+                self.results_area.mark_unset(mark)
+        self.results_area.config(state=tk.DISABLED)
 
-        for idx, recipe in enumerate(recipes):
-            self.results_area.insert(tk.END, f"Recipe {idx+1}: {recipe.get('title', 'Unknown')}\n", "title")
-
-            self.results_area.insert(tk.END, f"\n⏱ Ready in {recipe.get('readyInMinutes', 'N/A')} minutes\n")
-
-            self.results_area.insert(tk.END, "📝 Ingredients:\n", "subheader")
-            for ing in recipe.get('extendedIngredients', []):
-                self.results_area.insert(tk.END, f"• {ing.get('original', 'N/A')}\n")
-
-            self.results_area.insert(tk.END, "\n👩🍳 Instructions:\n", "subheader")
-            for instruction in recipe.get('analyzedInstructions', []):
-                for step in instruction.get('steps', []):
-                    self.results_area.insert(tk.END, f"{step.get('number', '?')}. {step.get('step', 'No instructions')}\n")
-
-            if 'nutrition' in recipe and isinstance(recipe['nutrition'], dict):
-                self.results_area.insert(tk.END, "\n📊 Nutrition:\n", "subheader")
-                nutrients = {n['name']: n['amount'] for n in recipe['nutrition'].get('nutrients', [])}
-                self.results_area.insert(tk.END, f"Calories: {nutrients.get('Calories', 'N/A')} | Protein: {nutrients.get('Protein', 'N/A')}g\n")
+    def add_recipe(self, position: int, recipe: Dict):
+        """Show a recipe at its search position, whatever order the details arrive in."""
+        slot = bisect.bisect(self.current_positions, position)
+        before = f"recipe{self.current_positions[slot]}" if slot < len(self.current_positions) else None
+        self.current_positions.insert(slot, position)
+        self.current_recipes.insert(slot, recipe)
+        self.display_recipe(position, recipe, before)
+
+    def format_recipe(self, idx: int, recipe: Dict) -> List[str]:
+        """Text and tags of one recipe, as alternating insert() arguments."""
+        parts = [f"Recipe {idx+1}: {recipe.get('title', 'Unknown')}\n", "title"]
+        parts += [f"\n⏱ Ready in {recipe.get('readyInMinutes', 'N/A')} minutes\n", ()]
+
+        parts += ["📝 Ingredients:\n", "subheader"]
+        parts += ["".join(f"• {ing.get('original', 'N/A')}\n" for ing in recipe.get('extendedIngredients', [])), ()]
+
+        parts += ["\n👩🍳 Instructions:\n", "subheader"]
+        parts += ["".join(f"{step.get('number', '?')}. {step.get('step', 'No instructions')}\n"
+                          for instruction in recipe.get('analyzedInstructions', [])
+                          for step in instruction.get('steps', [])), ()]
+
+        if 'nutrition' in recipe and isinstance(recipe['nutrition'], dict):
+            parts += ["\n📊 Nutrition:\n", "subheader"]
+            nutrients = {n['name']: n['amount'] for n in recipe['nutrition'].get('nutrients', [])}
+            parts += [f"Calories: {nutrients.get('Calories', 'N/A')} | Protein: {nutrients.get('Protein', 'N/A')}g\n", ()]
+
+        parts += ["\n" + "="*100 + "\n\n", ()]
+        return parts
+
+    def display_recipe(self, idx: int, recipe: Dict, before: Optional[str] = None):
+        # One insert call per recipe, ahead of the block marked `before` or at the end.
+        # The block's own mark keeps right gravity, so later inserts ahead of it leave it on its first line.
+        self.results_area.config(state=tk.NORMAL)
+        start = self.results_area.index(before or "end-1c")
+        self.results_area.insert(start, *self.format_recipe(idx, recipe))
+        self.results_area.mark_set(f"recipe{idx}", start)
+        self.results_area.config(state=tk.DISABLED)
 
-            self.results_area.insert(tk.END, "\n" + "="*100 + "\n\n")
+    def display_results(self, recipes: List[Dict]):
+        self.clear_results()
+        for idx, recipe in enumerate(recipes):
+            self.add_recipe(idx, recipe)
 
-        self.results_area.config(state=tk.DISABLED)
+    def close(self):
+        self.cancel_search.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
     def run(self):
         self.root.mainloop()
@@ -0,0 +1,68 @@
+import asyncio
+import json
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Tuple
+
+async def stream_with_retries(worker: Callable[[str], Dict], items: List[str], concurrency: int = 4,
+                              timeout: float = 60.0, retries: int = 3, backoff: float = 1.0,
+                              max_backoff: float = 30.0) -> AsyncIterator[Tuple[int, Dict]]:
+    """
+    Run the blocking worker(item) for every item on a dedicated pool of
+    `concurrency` threads and yield (index, result) as each one completes.
+
+    An attempt that takes longer than `timeout` seconds is retried at once;
+    one that raises is retried after a full-jitter exponential backoff, up to
+    `retries` times in all, after which the result is {"error": ...}. A
+    thread cannot be interrupted, so a timed-out call keeps its slot until
+    it really returns (never more than `concurrency` calls run), and if it
+    succeeds before the retry does, its result is used.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def attempt(index: int, item: str) -> Tuple[int, Dict]:
+        running = set()   # this item's calls, including timed-out ones still in flight
+        for n in range(retries + 1):
+            await semaphore.acquire()
+            call = loop.run_in_executor(executor, worker, item)
+            call.add_done_callback(lambda _: semaphore.release())
+            running.add(call)
+
+            deadline = loop.time() + timeout
+            while True:
+                done, _ = await asyncio.wait(running, timeout=max(0.0, deadline - loop.time()),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    error = f"timed out after {timeout}s"
+                    break
+                for finished in done:
+                    running.discard(finished)
+                    if finished.exception() is None:
+                        return index, finished.result()
+                # A failed earlier call says nothing about the current one
+                if call in done:
+                    error = str(call.exception())
+                    if n < retries:
+                        await asyncio.sleep(random.uniform(0, min(max_backoff, backoff * 2 ** n)))
+                    break
+        return index, {"error": f"Failed after {retries + 1} attempts: {error}"}
+
+    tasks = [asyncio.ensure_future(attempt(index, item)) for index, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+async def answer_file(agent, path: str, concurrency: int = 4, out=sys.stdout):
+    """Answer one query per line of `path`, writing a JSON line per query as it completes."""
+    with open(path, encoding="utf-8") as f:
+        queries = [line.strip() for line in f if line.strip()]
+    async for index, result in agent.generate_responses(queries, concurrency=concurrency):
+        out.write(json.dumps({"index": index, "query": queries[index], **result}) + "\n")
+        out.flush()
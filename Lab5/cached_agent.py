@@ -0,0 +1,127 @@
+import copy
+import re
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from async_batch import stream_with_retries
+from response_cache import ResponseCache
+from similarity_cache import SimilarityCache
+
+class CachedAgent(ABC):
+    """
+    Answer flow shared by LegalAgent and MovieAgent: scope check, exact and
+    near-duplicate response caches, then a local answer or a model call.
+
+    Subclasses set system_prompt, model, agent, indicator_matcher,
+    keyword_matcher, out_of_scope_error and failure_prefix, call
+    setup_caches, implement build_prompt and parse_response, and may
+    override local_answer.
+    """
+
+    out_of_scope_error = "This query is out of scope."
+    failure_prefix = "Error processing query"
+
+    def setup_caches(self, cache: Optional[ResponseCache], similarity_cache: Optional[SimilarityCache],
+                     cache_path: str):
+        # Parsed responses are cached on disk, keyed by query, prompt and model
+        self.cache = cache if cache is not None else ResponseCache(cache_path)
+        # Rephrasings of earlier queries reuse their answer without a model call
+        self.similarity_cache = similarity_cache if similarity_cache is not None else SimilarityCache()
+
+    def preprocess_query(self, query: str) -> str:
+        """Clean and standardize the input query."""
+        query = re.sub(r'[^\w\s]', ' ', query)
+        return ' '.join(query.split()).lower()
+
+    def validate_query(self, query: str) -> bool:
+        """True if the query mentions any of the agent's scope indicators."""
+        return self.indicator_matcher.any_match(query)
+
+    def relevant_labels(self, query: str) -> List[str]:
+        """Keyword groups (practice areas, categories) the query touches."""
+        return [label for label, score in self.keyword_matcher.scores(query).items() if score > 0]
+
+    def index_fingerprint(self) -> str:
+        """Identifies the local index that answers and prompts depend on; "" if there is none."""
+        return ""
+
+    def cache_key(self, query: str) -> str:
+        """Cache key for a query under the current system prompt, model and local index."""
+        model_id = getattr(self.agent.model, "id", type(self.agent.model).__name__)
+        return ResponseCache.make_key(self.preprocess_query(query), self.system_prompt, model_id,
+                                      self.index_fingerprint())
+
+    def make_agent(self):
+        """
+        A new Phi agent on its own copy of the model template (Groq if none
+        was given); batch threads each get one, as agents keep per-run state.
+        """
+        # Imported here so the shared flow can be used and tested without phi
+        from phi.agent import Agent
+        from phi.model.groq import Groq
+        return Agent(
+            model=copy.deepcopy(self.model) if self.model is not None else Groq(),
+            system_prompt=self.system_prompt
+        )
+
+    def local_answer(self, query: str, relevant: List[str]) -> Tuple[Optional[Dict], Any]:
+        """(answer without a model call or None, context passed on to build_prompt)."""
+        return None, None
+
+    @abstractmethod
+    def build_prompt(self, query: str, relevant: List[str], context: Any = None) -> str:
+        """Model prompt for the query, given the context from local_answer."""
+
+    @abstractmethod
+    def parse_response(self, response: str, relevant: List[str]) -> Tuple[Dict, bool]:
+        """(response dict, parsed) for the raw model output; parsed is False on fallback."""
+
+    def _respond(self, query: str, agent=None) -> Dict:
+        """generate_response without the error handling, so batch mode can retry failures."""
+        if not self.validate_query(query):
+            return {"error": self.out_of_scope_error}
+
+        key = self.cache_key(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        normalized = self.preprocess_query(query)
+        similar = self.similarity_cache.lookup(normalized)
+        if similar is not None:
+            return similar
+
+        relevant = self.relevant_labels(query)
+        result, context = self.local_answer(query, relevant)
+        parsed = True
+        if result is None:
+            # Get response from Phi agent
+            response = (agent or self.agent).run(self.build_prompt(query, relevant, context))
+            result, parsed = self.parse_response(response, relevant)
+
+        # Don't pin parsing failures in the cache
+        if parsed:
+            self.cache.set(key, result)
+            self.similarity_cache.add(normalized, result)
+        return result
+
+    def generate_response(self, query: str) -> Dict:
+        """Answer one query, served from the cache when possible."""
+        try:
+            return self._respond(query)
+        except Exception as e:
+            return {"error": f"{self.failure_prefix}: {str(e)}"}
+
+    async def generate_responses(self, queries: List[str], concurrency: int = 4, timeout: float = 60.0,
+                                 retries: int = 3) -> AsyncIterator[Tuple[int, Dict]]:
+        """Answer many queries concurrently, yielding (index, response) as each one completes."""
+        local = threading.local()
+
+        def worker(query):
+            # One model agent per pool thread, created on its first query
+            if not hasattr(local, "agent"):
+                local.agent = self.make_agent()
+            return self._respond(query, local.agent)
+
+        async for index, result in stream_with_retries(worker, queries, concurrency, timeout, retries):
+            yield index, result
@@ -0,0 +1,126 @@
+import re
+from typing import Dict, Iterable, List, Set
+
+_WORD = re.compile(r"\w+")
+
+def normalize_token(token: str) -> str:
+    """Lowercase and drop a plural "s" so "rights" matches "right" and "wages" matches "wage"."""
+    token = token.lower()
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    """Same word split as preprocess_query, with normalized tokens."""
+    return [normalize_token(token) for token in _WORD.findall(text)]
+
+# Stopword sets hold normalized tokens ("this" -> "thi"), as they are compared with tokenize() output.
+# Function words only shape the sentence; role words (pronouns, prepositions) say who
+# acts on whom and in which direction. Retrieval ignores both, but two questions that
+# differ in their role words ("sue me"/"sue you", "to texas"/"from texas") differ in meaning.
+FUNCTION_WORDS = {normalize_token(word) for word in (
+    "a", "an", "the", "and", "or", "is", "are", "be", "can", "what", "how", "do", "does", "if", "it",
+    "that", "this", "as", "was", "will", "should", "would", "could", "any", "there",
+)}
+ROLE_WORDS = {normalize_token(word) for word in (
+    "i", "me", "my", "you", "your", "we", "they", "their", "of", "to", "in", "on", "for", "with", "by",
+    "at", "from", "about", "under", "against",
+)}
+STOPWORDS = FUNCTION_WORDS | ROLE_WORDS
+
+def content_words(text: str) -> List[str]:
+    """Normalized tokens without stopwords."""
+    return [token for token in tokenize(text) if token not in STOPWORDS]
+
+class KeywordMatcher:
+    """
+    Word-level Aho-Corasick automaton over groups of keywords. Keywords and
+    queries are tokenized the same way, so matches always fall on word
+    boundaries ("ada" does not match inside "canada") and multi-word
+    keywords like "child support" are found in the same single pass.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.labels = list(groups)
+        self.keywords = []        # keyword id -> original keyword
+        self.keyword_label = []   # keyword id -> label index
+        self.group_sizes = [0] * len(self.labels)
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [set()]
+        for label_index, label in enumerate(self.labels):
+            for keyword in groups[label]:
+                self._insert(tokenize(keyword), len(self.keywords))
+                self.keywords.append(keyword)
+                self.keyword_label.append(label_index)
+                self.group_sizes[label_index] += 1
+        self._build_failure_links()
+
+    def _insert(self, tokens: List[str], keyword_id: int):
+        node = 0
+        for token in tokens:
+            if token not in self._goto[node]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+                self._goto[node][token] = len(self._goto) - 1
+            node = self._goto[node][token]
+        self._output[node].add(keyword_id)
+
+    def _build_failure_links(self):
+        # Breadth-first, so every failure target is finished before it is used
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for token, child in self._goto[node].items():
+                state = self._fail[node]
+                while state and token not in self._goto[state]:
+                    state = self._fail[state]
+                target = self._goto[state].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] |= self._output[self._fail[child]]
+                queue.append(child)
+
+    def find(self, text: str) -> Set[int]:
+        """Ids of all keywords that occur in the text."""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for token in tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+    def any_match(self, text: str) -> bool:
+        """True as soon as any keyword occurs."""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for token in tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                return True
+        return False
+
+    def matches(self, text: str) -> Dict[str, List[str]]:
+        """Matched keywords per label."""
+        result = {label: [] for label in self.labels}
+        for keyword_id in sorted(self.find(text)):
+            result[self.labels[self.keyword_label[keyword_id]]].append(self.keywords[keyword_id])
+        return result
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Fraction of each label's keywords that occur in the text."""
+        counts = [0] * len(self.labels)
+        for keyword_id in self.find(text):
+            counts[self.keyword_label[keyword_id]] += 1
+        return {label: counts[i] / self.group_sizes[i] if counts[i] else 0
+                for i, label in enumerate(self.labels)}
+
+    def scores_batch(self, texts: Iterable[str]) -> List[Dict[str, float]]:
+        """scores() for every text, e.g. the lines of a query log."""
+        return [self.scores(text) for text in texts]
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from keyword_matcher import KeywordMatcher, tokenize
+
+# Catalog entries use the "recommendations" schema of MovieAgent responses
+# (title, year, director, genre, synopsis, rating, content_warnings,
+# streaming), optionally with a "tags" list such as moods or audiences.
+
+RECOMMENDATION_FIELDS = ["title", "year", "director", "genre", "synopsis", "rating", "content_warnings", "streaming"]
+
+def era_tags(year) -> List[str]:
+    """Era keywords from MovieAgent.categories implied by a release year."""
+    try:
+        year = int(str(year)[:4])
+    except ValueError:
+        return []
+    tags = []
+    if year < 1930:
+        tags.append("silent era")
+    elif year < 1960:
+        tags.append("golden age")
+    if year < 1980:
+        tags.append("classic")
+    if year >= 2000:
+        tags.append("modern")
+        tags.append(f"{year // 10 * 10}s")
+    elif year >= 1980:
+        tags.append(f"{year // 10 % 10 * 10}s")
+    return tags
+
+class MovieIndex:
+    """
+    Movie catalog as one contiguous float32 matrix: a one-hot column per
+    category keyword plus signed hashed text features, each block L2
+    normalized. Queries are scored with one matrix product per batch.
+    """
+
+    def __init__(self, movies: List[Dict], categories: Dict[str, List[str]], hash_dim: int = 1024,
+                 keyword_weight: float = 1.0, text_weight: float = 0.5):
+        self.movies = movies
+        self.categories = categories
+        self.hash_dim = hash_dim
+        self.keyword_weight = keyword_weight
+        self.text_weight = text_weight
+        self.matcher = KeywordMatcher(categories)
+        self.n_keywords = len(self.matcher.keywords)
+        # Largest possible product of two vectors, used to scale scores to 0..1
+        self.max_score = keyword_weight ** 2 + text_weight ** 2
+
+        self.matrix = np.zeros((len(movies), self.n_keywords + hash_dim), dtype=np.float32)
+        for row, movie in enumerate(movies):
+            self.matrix[row, :self.n_keywords] = self.keyword_features(self.movie_keyword_text(movie))
+            self.matrix[row, self.n_keywords:] = self.hashed_counts(self.movie_text(movie))
+        # Inverse document frequency per bucket, so words every synopsis shares count for little
+        text_block = self.matrix[:, self.n_keywords:]
+        df = np.count_nonzero(text_block, axis=0)
+        self.idf = np.log((len(movies) + 1) / (df + 1)).astype(np.float32)
+        text_block *= self.idf
+        norms = np.linalg.norm(text_block, axis=1, keepdims=True)
+        np.divide(text_block * text_weight, norms, out=text_block, where=norms > 0)
+        # Keyword presence per movie, for prefiltering
+        self.has_keyword = self.matrix[:, :self.n_keywords] > 0
+        # Changes whenever the catalog or the feature settings do
+        self.fingerprint = hashlib.sha256(json.dumps(
+            [movies, categories, hash_dim, keyword_weight, text_weight], sort_keys=True).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def from_jsonl(cls, path: str, categories: Dict[str, List[str]], **kwargs) -> "MovieIndex":
+        with open(path, encoding="utf-8") as f:
+            movies = [json.loads(line) for line in f if line.strip()]
+        return cls(movies, categories, **kwargs)
+
+    def __len__(self):
+        return len(self.movies)
+
+    @staticmethod
+    def movie_text(movie: Dict) -> str:
+        return " ".join([movie.get("title", ""), movie.get("director", ""), movie.get("synopsis", "")])
+
+    @staticmethod
+    def movie_keyword_text(movie: Dict) -> str:
+        # Keyword columns come from genres, tags, era and synopsis, not from the title
+        parts = list(movie.get("genre", [])) + list(movie.get("tags", [])) + era_tags(movie.get("year", ""))
+        return " . ".join(parts + [movie.get("synopsis", "")])
+
+    def keyword_features(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.n_keywords, dtype=np.float32)
+        keyword_ids = list(self.matcher.find(text))
+        if keyword_ids:
+            vector[keyword_ids] = self.keyword_weight / np.sqrt(len(keyword_ids))
+        return vector
+
+    def hashed_counts(self, text: str) -> np.ndarray:
+        # Signed feature hashing: colliding words tend to cancel rather than add up
+        counts = np.zeros(self.hash_dim, dtype=np.float32)
+        for token in tokenize(text):
+            h = zlib.crc32(token.encode("utf-8"))
+            counts[h % self.hash_dim] += 1.0 if h & 0x80000000 else -1.0
+        return counts
+
+    def vectorize(self, query: str) -> np.ndarray:
+        """Query vector in the same feature space as the catalog rows."""
+        hashed = self.hashed_counts(query) * self.idf
+        norm = np.linalg.norm(hashed)
+        if norm:
+            hashed *= self.text_weight / norm
+        return np.concatenate((self.keyword_features(query), hashed))
+
+    def prefilter(self, query: str) -> Optional[np.ndarray]:
+        """
+        Movies that have at least one of the query's keywords in every
+        category the query mentions; None if the query names no keywords.
+        """
+        by_category = {}
+        for keyword_id in self.matcher.find(query):
+            by_category.setdefault(self.matcher.keyword_label[keyword_id], []).append(keyword_id)
+        mask = None
+        for keyword_ids in by_category.values():
+            in_category = self.has_keyword[:, keyword_ids].any(axis=1)
+            mask = in_category if mask is None else mask & in_category
+        return mask
+
+    def search_batch(self, queries: List[str], k: int = 10, min_score: float = 0.0) -> List[List[Dict]]:
+        """
+        Top-k catalog entries per query, each with a similarity score in 0..1.
+        Entries scoring min_score or less are dropped, and a query whose
+        keywords no movie has gets no results.
+        """
+        if not self.movies or not queries:
+            return [[] for _ in queries]
+        query_matrix = np.stack([self.vectorize(query) for query in queries])
+        scores = (query_matrix @ self.matrix.T) / self.max_score
+
+        results = []
+        for i, query in enumerate(queries):
+            row = scores[i]
+            mask = self.prefilter(query)
+            if mask is not None:
+                if not mask.any():
+                    results.append([])
+                    continue
+                row = np.where(mask, row, -np.inf)
+            top = np.argpartition(-row, min(k, len(row) - 1))[:k]
+            top = top[np.argsort(-row[top])]
+            results.append([self.recommendation(int(j), float(row[j])) for j in top if row[j] > min_score])
+        return results
+
+    def search(self, query: str, k: int = 10, min_score: float = 0.0) -> List[Dict]:
+        return self.search_batch([query], k, min_score)[0]
+
+    def recommendation(self, row: int, score: float) -> Dict:
+        movie = self.movies[row]
+        entry = {field: movie.get(field, [] if field in ("genre", "content_warnings", "streaming") else "")
+                 for field in RECOMMENDATION_FIELDS}
+        entry["score"] = round(score, 4)
+        return entry
@@ -0,0 +1,78 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+class RecipeCache:
+    """
+    SQLite store for API responses with the validators needed to revalidate
+    them (ETag, Last-Modified). Expired entries are kept, so they can still be
+    revalidated or served stale while the API is unreachable.
+    """
+
+    def __init__(self, path: str = "recipe_cache.sqlite3"):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stale_served = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched REAL NOT NULL
+            )""")
+        self._conn.commit()
+
+    @staticmethod
+    def search_key(params: Dict) -> str:
+        """Key for a search: its params, sorted, without the API key and with free text normalized."""
+        key = {k: v for k, v in params.items() if k != "apiKey"}
+        # "Pasta  Carbonara" and "pasta carbonara" are the same search
+        if isinstance(key.get("query"), str):
+            key["query"] = " ".join(key["query"].lower().split())
+        if isinstance(key.get("includeIngredients"), str):
+            key["includeIngredients"] = ",".join(" ".join(part.lower().split())
+                                                 for part in key["includeIngredients"].split(","))
+        return "search:" + json.dumps(key, sort_keys=True)
+
+    @staticmethod
+    def recipe_key(recipe_id: int) -> str:
+        return f"recipe:{recipe_id}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """The stored entry (value, etag, last_modified, age in seconds), fresh or not."""
+        with self._lock:
+            row = self._conn.execute("SELECT value, etag, last_modified, fetched FROM entries WHERE key = ?",
+                                     (key,)).fetchone()
+        if row is None:
+            return None
+        return {"value": json.loads(row[0]), "etag": row[1], "last_modified": row[2], "age": time.time() - row[3]}
+
+    def put(self, key: str, value, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                               (key, json.dumps(value), etag, last_modified, time.time()))
+            self._conn.commit()
+
+    def touch(self, key: str):
+        """Mark an entry fresh again after a 304 Not Modified."""
+        with self._lock:
+            self._conn.execute("UPDATE entries SET fetched = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "stale_served": self.stale_served,
+            "entries": entries,
+        }
@@ -0,0 +1,233 @@
+import json
+import re
+from collections import Counter, defaultdict
+from functools import reduce
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z]+")
+_HTML = re.compile(r"<[^>]+>")
+
+# Words in an ingredient line that never name the ingredient itself
+_INGREDIENT_NOISE = {
+    "cup", "tbsp", "tsp", "oz", "g", "kg", "ml", "l", "pound", "ounce", "gram", "liter",
+    "chopped", "diced", "minced", "sliced", "grated", "fresh", "large", "small", "medium", "of", "and", "or",
+}
+
+# Spoonacular's boolean flags for the diets in setup_dietary_preferences
+_DIET_FLAGS = {"vegetarian": "vegetarian", "vegan": "vegan", "glutenFree": "gluten free", "dairyFree": "dairy free"}
+
+def _singular(word: str) -> str:
+    if len(word) > 3 and word.endswith("es") and word[-3] in "osx":
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+# Words in titles and instructions too common to rank by, in singular form like the tokens
+# ("this" -> "thi"); most postings would otherwise belong to them
+_TEXT_STOPWORDS = {_singular(word) for word in (
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "with", "for", "from", "into", "at", "by", "is",
+    "are", "be", "it", "this", "that", "then", "until", "how", "what", "i", "my", "you", "your", "can",
+)}
+
+def ingredient_tokens(text: str) -> List[str]:
+    """Tokens naming an ingredient, e.g. "2 cups chopped tomatoes" -> ["tomato"]."""
+    return [_singular(w) for w in _WORD.findall(text.lower()) if w not in _INGREDIENT_NOISE]
+
+def text_tokens(text: str) -> List[str]:
+    """Singular word tokens of a title or instructions, without HTML tags and stopwords."""
+    return [t for t in (_singular(w) for w in _WORD.findall(_HTML.sub(" ", text).lower()))
+            if t not in _TEXT_STOPWORDS]
+
+def write_jsonl(recipes: Iterable[Dict], path: str):
+    """Append get_recipe_details responses to a JSONL corpus."""
+    with open(path, "a", encoding="utf-8") as f:
+        for recipe in recipes:
+            if recipe:
+                f.write(json.dumps(recipe) + "\n")
+
+class RecipeIndex:
+    """
+    In-memory search over a corpus of recipe detail dicts: inverted indexes
+    for ingredients, cuisines and diets, plus BM25 over titles and
+    instructions. Results keep the complexSearch/information dict shape.
+
+    Postings are collected in dicts while recipes are added and frozen into
+    NumPy arrays on the next search. Each text posting then holds its whole
+    BM25 contribution (idf and length norm included), so a query term costs
+    one vectorized add.
+    """
+
+    def __init__(self, cuisines: Dict[str, List[str]], dietary_options: Dict[str, str], k1: float = 1.2, b: float = 0.75):
+        self.cuisines = cuisines
+        self.dietary_options = dietary_options
+        self.k1 = k1
+        self.b = b
+        # Signature dishes in a title also place a recipe in a cuisine
+        self.dish_cuisine = {_singular(dish.lower()): cuisine for cuisine, dishes in cuisines.items() for dish in dishes}
+
+        self.recipes = []
+        self.ingredient_postings = defaultdict(set)
+        self.cuisine_postings = defaultdict(set)
+        self.diet_postings = defaultdict(set)
+        self.term_postings = defaultdict(dict)    # term -> {doc: term frequency}
+        self.doc_lengths = []
+        self.total_length = 0
+        self._frozen = None                       # array form of the postings, built by _freeze
+
+    @classmethod
+    def from_jsonl(cls, path: str, cuisines: Dict[str, List[str]], dietary_options: Dict[str, str]) -> "RecipeIndex":
+        index = cls(cuisines, dietary_options)
+        seen = set()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    recipe = json.loads(line)
+                    # Later dumps of the same recipe are duplicates
+                    if recipe.get("id") not in seen:
+                        seen.add(recipe.get("id"))
+                        index.add(recipe)
+        return index
+
+    def __len__(self):
+        return len(self.recipes)
+
+    def add(self, recipe: Dict):
+        doc = len(self.recipes)
+        self.recipes.append(recipe)
+        self._frozen = None
+
+        ingredients = set()
+        for ingredient in recipe.get("extendedIngredients", []):
+            ingredients.update(ingredient_tokens(ingredient.get("name") or ingredient.get("original", "")))
+        for token in ingredients:
+            self.ingredient_postings[token].add(doc)
+
+        title = recipe.get("title", "")
+        for cuisine in self._cuisines_of(recipe, title):
+            self.cuisine_postings[cuisine].add(doc)
+        for diet in self._diets_of(recipe):
+            self.diet_postings[diet].add(doc)
+
+        terms = text_tokens(title) + text_tokens(self._instructions_text(recipe))
+        for term, count in Counter(terms).items():
+            self.term_postings[term][doc] = count
+        self.doc_lengths.append(len(terms))
+        self.total_length += len(terms)
+
+    def _cuisines_of(self, recipe: Dict, title: str) -> Set[str]:
+        labels = {c.lower() for c in recipe.get("cuisines", [])}
+        found = {cuisine for cuisine in self.cuisines if cuisine.lower() in labels}
+        found.update(self.dish_cuisine[w] for w in text_tokens(title) if w in self.dish_cuisine)
+        return found
+
+    def _diets_of(self, recipe: Dict) -> Set[str]:
+        labels = {d.lower() for d in recipe.get("diets", [])}
+        found = {diet for diet in self.dietary_options.values() if diet in labels}
+        found.update(diet for flag, diet in _DIET_FLAGS.items() if recipe.get(flag))
+        # Spoonacular labels vegetarian recipes "lacto ovo vegetarian"
+        if any("vegetarian" in label for label in labels):
+            found.add("vegetarian")
+        return found
+
+    @staticmethod
+    def _instructions_text(recipe: Dict) -> str:
+        steps = [step.get("step", "") for instruction in recipe.get("analyzedInstructions", [])
+                 for step in instruction.get("steps", [])]
+        return " ".join(steps) or recipe.get("instructions") or ""
+
+    def _diet_key(self, diet: str) -> str:
+        # Accept the GUI label ("Gluten-Free") or the API value ("gluten free")
+        return self.dietary_options.get(diet, diet).lower()
+
+    def _cuisine_key(self, cuisine: str) -> Optional[str]:
+        return next((c for c in self.cuisines if c.lower() == cuisine.lower()), None)
+
+    def _freeze(self) -> Dict:
+        n = len(self.recipes)
+        lengths = np.asarray(self.doc_lengths, dtype=np.float64)
+        average_length = self.total_length / n if n else 0.0
+        norms = self.k1 * (1 - self.b + self.b * lengths / average_length) if average_length else np.full(n, self.k1)
+
+        terms = {}
+        for term, postings in self.term_postings.items():
+            docs = np.fromiter(postings.keys(), dtype=np.int32, count=len(postings))
+            tf = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            idf = np.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            terms[term] = (docs, idf * tf * (self.k1 + 1) / (tf + norms[docs]))
+
+        def sorted_docs(postings):
+            return {key: np.array(sorted(docs), dtype=np.int32) for key, docs in postings.items()}
+
+        self._frozen = {
+            "terms": terms,
+            "ingredients": sorted_docs(self.ingredient_postings),
+            "cuisines": sorted_docs(self.cuisine_postings),
+            "diets": sorted_docs(self.diet_postings),
+        }
+        return self._frozen
+
+    def _mask(self, docs: Optional[np.ndarray]) -> np.ndarray:
+        mask = np.zeros(len(self.recipes), dtype=bool)
+        if docs is not None:
+            mask[docs] = True
+        return mask
+
+    def bm25(self, terms: List[str], allowed: Optional[np.ndarray] = None) -> np.ndarray:
+        """BM25 score of every document (0 without a query term), zeroed outside the `allowed` mask."""
+        frozen = self._frozen or self._freeze()
+        scores = np.zeros(len(self.recipes))
+        for term in set(terms):
+            posting = frozen["terms"].get(term)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+        if allowed is not None:
+            scores[~allowed] = 0.0
+        return scores
+
+    def search(self, query: str = None, ingredients: List[str] = None, cuisine: str = None,
+               diet: str = None, number: int = 5) -> List[Dict]:
+        """Same arguments and result shape as RecipeAgent.search_recipes."""
+        frozen = self._frozen or self._freeze()
+        allowed = None
+        if cuisine:
+            key = self._cuisine_key(cuisine)
+            allowed = self._mask(frozen["cuisines"].get(key))
+        if diet:
+            diet_docs = self._mask(frozen["diets"].get(self._diet_key(diet)))
+            allowed = diet_docs if allowed is None else allowed & diet_docs
+
+        # Ingredient overlap: an ingredient matches a recipe having all its tokens
+        used = np.zeros(len(self.recipes))
+        wanted = [tokens for tokens in (ingredient_tokens(i) for i in ingredients or []) if tokens]
+        empty = np.zeros(0, dtype=np.int32)
+        for tokens in wanted:
+            postings = [frozen["ingredients"].get(t, empty) for t in tokens]
+            used[reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), postings)] += 1
+        if allowed is not None:
+            used[~allowed] = 0
+
+        text_scores = self.bm25(text_tokens(query), allowed) if query else np.zeros(len(self.recipes))
+
+        if wanted or query:
+            candidates = np.flatnonzero((used > 0) | (text_scores > 0))
+            if len(candidates) > number:
+                # Keep everything tied with the number-th best, then order by
+                # (ingredients used, text score, corpus order)
+                key = used[candidates] * (text_scores[candidates].max() + 1) + text_scores[candidates]
+                kth = np.partition(key, len(key) - number)[len(key) - number]
+                candidates = candidates[key >= kth]
+            best = candidates[np.lexsort((candidates, -text_scores[candidates], -used[candidates]))][:number]
+        else:
+            best = (np.flatnonzero(allowed) if allowed is not None else np.arange(len(self.recipes)))[:number]
+
+        results = []
+        for doc in best:
+            result = dict(self.recipes[doc])
+            if wanted:
+                result["usedIngredientCount"] = int(used[doc])
+                result["missedIngredientCount"] = len(wanted) - int(used[doc])
+            results.append(result)
+        return results
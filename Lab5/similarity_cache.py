@@ -0,0 +1,135 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from keyword_matcher import FUNCTION_WORDS, ROLE_WORDS, tokenize
+
+# Mersenne prime for the universal hash family (a * x + b) mod p
+_PRIME = np.uint64((1 << 61) - 1)
+
+def question_words(query: str) -> List[str]:
+    """Normalized tokens without function words; pronouns and prepositions are kept."""
+    return [token for token in tokenize(query) if token not in FUNCTION_WORDS]
+
+def shingles(query: str, size: int = 2) -> Set[str]:
+    """Word n-grams of length 1..size over the question words of a query."""
+    words = question_words(query)
+    return {" ".join(words[i:i + n]) for n in range(1, size + 1) for i in range(len(words) - n + 1)}
+
+def anchors(shingle_set: Set[str]) -> Set[str]:
+    """Shingles two queries must share exactly: every word, and every n-gram with a role word in it."""
+    return {s for s in shingle_set if " " not in s or not ROLE_WORDS.isdisjoint(s.split(" "))}
+
+def _hash32(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+class SimilarityCache:
+    """
+    Near-duplicate query cache: MinHash signatures over question-word
+    shingles, bucketed by an LSH band index. A stored answer is reused only
+    when the queries differ by nothing but function words ("ohio" vs "texas"
+    or "legal" vs "illegal" never match), every pronoun and preposition
+    has the same neighbours ("to texas from ohio" vs "from texas to ohio",
+    "can you sue me" vs "can i sue you"), and the Jaccard similarity of the
+    shingle sets, which also reflects word order, is at least `threshold`.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 64, bands: int = 16,
+                 shingle_size: int = 2, max_entries: int = 10_000, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        rng = np.random.default_rng(seed)
+        # a * x + b stays below 2**64 for 32-bit shingle hashes
+        self._a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, num_perm, dtype=np.uint64)
+
+        self._entries = OrderedDict()   # query -> (shingle set, anchors, band keys, value)
+        self._buckets = {}              # (band, band hash) -> set of queries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def signature(self, shingle_set: Set[str]) -> np.ndarray:
+        """MinHash signature (num_perm uint64 values) of a shingle set."""
+        if not shingle_set:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        x = np.fromiter((_hash32(s) for s in shingle_set), dtype=np.uint64, count=len(shingle_set))
+        hashed = (x[:, np.newaxis] * self._a + self._b) % _PRIME
+        return hashed.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[tuple]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def lookup(self, query: str) -> Optional[Dict]:
+        """Return the answer of the most similar stored query above the threshold, or None."""
+        shingle_set = shingles(query, self.shingle_size)
+        if not shingle_set:
+            with self._lock:
+                self.misses += 1
+            return None
+        required = anchors(shingle_set)
+        band_keys = self._band_keys(self.signature(shingle_set))
+        with self._lock:
+            candidates = set()
+            for band_key in band_keys:
+                candidates.update(self._buckets.get(band_key, ()))
+
+            best, best_similarity = None, self.threshold
+            for candidate in candidates:
+                other, other_anchors = self._entries[candidate][:2]
+                if required != other_anchors:
+                    continue
+                similarity = len(shingle_set & other) / len(shingle_set | other)
+                if similarity >= best_similarity:
+                    best, best_similarity = candidate, similarity
+
+            if best is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best)
+            self.hits += 1
+            return self._entries[best][3]
+
+    def add(self, query: str, value: Dict):
+        """Store the answer for a preprocessed query, evicting the least recently used entry if full."""
+        shingle_set = shingles(query, self.shingle_size)
+        if not shingle_set:
+            return
+        band_keys = self._band_keys(self.signature(shingle_set))
+        with self._lock:
+            if query in self._entries:
+                self._remove(query)
+            self._entries[query] = (shingle_set, anchors(shingle_set), band_keys, value)
+            for band_key in band_keys:
+                self._buckets.setdefault(band_key, set()).add(query)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, query: str):
+        _, _, band_keys, _ = self._entries.pop(query)
+        for band_key in band_keys:
+            bucket = self._buckets[band_key]
+            bucket.discard(query)
+            if not bucket:
+                del self._buckets[band_key]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
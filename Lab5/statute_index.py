@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import sys
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from keyword_matcher import content_words as terms
+
+# Index layout in a directory:
+#   terms.json      term -> [offset, document frequency] into the posting arrays
+#   docs.npy        int32 document ids, grouped by term      (memory-mapped)
+#   tfs.npy         float32 term frequencies, same order     (memory-mapped)
+#   lengths.npy     float32 token count per document
+#   areas.npy       int16 practice-area id per document
+#   passages.json   {"areas": [...], "passages": [...]}
+#
+# Each corpus line is a passage: id, name, citation, jurisdiction,
+# practice_area, text and optionally a structured "summary" with the
+# explanation/advice/jurisdiction_notes fields of a LegalAgent answer.
+
+def build_statute_index(corpus_path: str, index_dir: str):
+    """Tokenize a JSONL corpus of statutes and case summaries and write the on-disk index."""
+    with open(corpus_path, encoding="utf-8") as f:
+        passages = [json.loads(line) for line in f if line.strip()]
+
+    areas = sorted({p.get("practice_area", "general") for p in passages})
+    area_ids = {area: i for i, area in enumerate(areas)}
+    postings = {}
+    lengths = np.zeros(len(passages), dtype=np.float32)
+    for doc, passage in enumerate(passages):
+        tokens = terms(" ".join([passage.get("name", ""), passage.get("citation", ""), passage.get("text", "")]))
+        lengths[doc] = len(tokens)
+        for term, count in Counter(tokens).items():
+            postings.setdefault(term, []).append((doc, count))
+
+    term_table = {}
+    docs, tfs = [], []
+    for term in sorted(postings):
+        term_table[term] = [len(docs), len(postings[term])]
+        for doc, count in postings[term]:
+            docs.append(doc)
+            tfs.append(count)
+
+    os.makedirs(index_dir, exist_ok=True)
+    np.save(os.path.join(index_dir, "docs.npy"), np.array(docs, dtype=np.int32))
+    np.save(os.path.join(index_dir, "tfs.npy"), np.array(tfs, dtype=np.float32))
+    np.save(os.path.join(index_dir, "lengths.npy"), lengths)
+    np.save(os.path.join(index_dir, "areas.npy"),
+            np.array([area_ids[p.get("practice_area", "general")] for p in passages], dtype=np.int16))
+    with open(os.path.join(index_dir, "terms.json"), "w", encoding="utf-8") as f:
+        json.dump(term_table, f)
+    with open(os.path.join(index_dir, "passages.json"), "w", encoding="utf-8") as f:
+        json.dump({"areas": areas, "passages": passages}, f)
+
+class StatuteIndex:
+    """BM25 retrieval over an index written by build_statute_index; posting lists stay memory-mapped."""
+
+    def __init__(self, index_dir: str, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs = np.load(os.path.join(index_dir, "docs.npy"), mmap_mode="r")
+        self.tfs = np.load(os.path.join(index_dir, "tfs.npy"), mmap_mode="r")
+        self.lengths = np.load(os.path.join(index_dir, "lengths.npy"))
+        self.areas = np.load(os.path.join(index_dir, "areas.npy"))
+        with open(os.path.join(index_dir, "terms.json"), "rb") as f:
+            terms_json = f.read()
+        with open(os.path.join(index_dir, "passages.json"), "rb") as f:
+            passages_json = f.read()
+        self.term_table = json.loads(terms_json)
+        meta = json.loads(passages_json)
+        # Changes whenever the index is rebuilt from a different corpus
+        digest = hashlib.sha256(terms_json)
+        digest.update(passages_json)
+        digest.update(f"{k1},{b}".encode("utf-8"))
+        self.fingerprint = digest.hexdigest()
+        self.area_names = meta["areas"]
+        self.passages = meta["passages"]
+        self.average_length = float(self.lengths.mean()) if len(self.lengths) else 0.0
+
+    def __len__(self):
+        return len(self.passages)
+
+    def area_mask(self, practice_areas: Optional[List[str]]) -> Optional[np.ndarray]:
+        """Documents in any of the areas, plus "general" ones; None means no filter."""
+        if not practice_areas:
+            return None
+        wanted = [i for i, area in enumerate(self.area_names) if area in practice_areas or area == "general"]
+        return np.isin(self.areas, wanted)
+
+    def search(self, query: str, k: int = 5, practice_areas: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Top-k passages by BM25, restricted to the practice areas if given.
+        Each hit is {"passage", "score", "coverage"}, where coverage is the
+        fraction of the query's (non-stopword) terms the passage contains.
+        """
+        all_terms = set(terms(query))
+        query_terms = [t for t in all_terms if t in self.term_table]
+        if not query_terms or not self.passages:
+            return []
+
+        n = len(self.passages)
+        scores = np.zeros(n, dtype=np.float32)
+        matched = np.zeros(n, dtype=np.int16)
+        for term in query_terms:
+            offset, df = self.term_table[term]
+            docs = self.docs[offset:offset + df]
+            tf = self.tfs[offset:offset + df]
+            idf = np.log(1 + (n - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[docs] / self.average_length)
+            scores[docs] += idf * tf * (self.k1 + 1) / (tf + norm)
+            matched[docs] += 1
+
+        mask = self.area_mask(practice_areas)
+        if mask is not None:
+            scores[~mask] = 0
+        hits = np.flatnonzero(scores)
+        top = hits[np.argsort(-scores[hits])[:k]]
+        return [{"passage": self.passages[doc], "score": float(scores[doc]),
+                 "coverage": float(matched[doc]) / len(all_terms)} for doc in top]
+
+    @staticmethod
+    def confident(hits: List[Dict], min_coverage: float = 0.8, margin: float = 1.5) -> bool:
+        """High confidence: the top passage covers the query and clearly beats the runner-up."""
+        if not hits or hits[0]["coverage"] < min_coverage:
+            return False
+        return len(hits) == 1 or hits[0]["score"] >= margin * hits[1]["score"]
+
+if __name__ == "__main__":
+    # python statute_index.py corpus.jsonl index_dir
+    build_statute_index(sys.argv[1], sys.argv[2])
@@ -0,0 +1,177 @@
+import asyncio
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from async_batch import stream_with_retries
+from cached_agent import CachedAgent
+from keyword_matcher import KeywordMatcher
+from response_cache import ResponseCache
+
+class FakeModelServer(ThreadingHTTPServer):
+    """Answers every POST after `delay` seconds, counting calls and the most in flight at once."""
+
+    daemon_threads = True
+
+    def __init__(self, delay: float):
+        super().__init__(("127.0.0.1", 0), FakeModelHandler)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+class FakeModelHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        prompt = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+        with server.lock:
+            server.calls += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+        body = json.dumps({"explanation": f"answer to {prompt}"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class FakeModel:
+    id = "fake-model"
+
+class HttpModelAgent:
+    """Stands in for a Phi agent: run() posts the prompt to the fake model server."""
+
+    def __init__(self, url: str, runs: dict):
+        self.model = FakeModel()
+        self.url = url
+        self.runs = runs
+
+    def run(self, prompt: str) -> str:
+        self.runs.setdefault(id(self), set()).add(threading.get_ident())
+        with urllib.request.urlopen(self.url, data=prompt.encode("utf-8")) as response:
+            return response.read().decode("utf-8")
+
+class FakeAgent(CachedAgent):
+    def __init__(self, url: str, cache_path: str):
+        self.url = url
+        self.runs = {}   # agent id -> threads that ran it
+        self.system_prompt = "test"
+        self.indicator_matcher = KeywordMatcher({"indicator": ["law"]})
+        self.keyword_matcher = KeywordMatcher({"contract": ["contract"]})
+        self.setup_caches(ResponseCache(cache_path), None, cache_path)
+        self.agent = self.make_agent()
+
+    def make_agent(self):
+        return HttpModelAgent(self.url, self.runs)
+
+    def build_prompt(self, query, relevant, context=None):
+        return query
+
+    def parse_response(self, response, relevant):
+        return json.loads(response), True
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(delay):
+        server = FakeModelServer(delay)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def collect(agent, queries, **kwargs):
+    async def run():
+        return dict([item async for item in agent.generate_responses(queries, **kwargs)])
+    return asyncio.run(run())
+
+QUERIES = [f"law question {n}" for n in range(6)]
+
+def test_concurrency_stays_bounded_when_calls_time_out(serve, tmp_path):
+    server, url = serve(delay=0.5)
+    agent = FakeAgent(url, str(tmp_path / "cache.sqlite3"))
+
+    results = collect(agent, QUERIES, concurrency=2, timeout=0.15, retries=2)
+
+    assert server.max_in_flight <= 2
+    assert server.calls <= len(QUERIES) * 3
+    assert results == {n: {"explanation": f"answer to {query}"} for n, query in enumerate(QUERIES)}
+
+def run_stream(worker, items, **kwargs):
+    async def run():
+        return dict([item async for item in stream_with_retries(worker, items, **kwargs)])
+    return asyncio.run(run())
+
+def test_timeout_retries_without_waiting_for_the_hung_call():
+    calls = []
+    release = threading.Event()
+
+    def worker(item):
+        calls.append(item)
+        if len(calls) == 1:
+            release.wait(5)   # hangs until the test ends
+            return "late"
+        return "retried"
+
+    start = time.perf_counter()
+    try:
+        results = run_stream(worker, ["a"], concurrency=2, timeout=0.1, retries=1)
+    finally:
+        release.set()
+    assert results == {0: "retried"}
+    assert time.perf_counter() - start < 1.0
+
+def test_late_result_is_used_instead_of_a_new_call():
+    calls = []
+
+    def worker(item):
+        calls.append(item)
+        number = len(calls)
+        time.sleep(0.3)
+        return f"answer {number}"
+
+    results = run_stream(worker, ["a"], concurrency=4, timeout=0.2, retries=3)
+
+    # The first call finishes at 0.3s, before the retry started at 0.2s does
+    assert results == {0: "answer 1"}
+    assert len(calls) == 2
+
+def test_each_worker_thread_has_its_own_agent(serve, tmp_path):
+    server, url = serve(delay=0.05)
+    agent = FakeAgent(url, str(tmp_path / "cache.sqlite3"))
+
+    results = collect(agent, QUERIES, concurrency=3)
+
+    assert len(results) == len(QUERIES)
+    assert server.max_in_flight <= 3
+    assert id(agent.agent) not in agent.runs
+    assert 1 <= len(agent.runs) <= 3
+    assert all(len(threads) == 1 for threads in agent.runs.values())
+
+def test_failures_are_reported_after_the_last_retry():
+    calls = []
+
+    def worker(item):
+        calls.append(item)
+        raise RuntimeError("boom")
+
+    async def run():
+        return [item async for item in stream_with_retries(worker, ["a"], retries=2, backoff=0)]
+
+    assert asyncio.run(run()) == [(0, {"error": "Failed after 3 attempts: boom"})]
+    assert calls == ["a", "a", "a"]
@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip("phi")
+from Recipeai import RecipeAgent
+
+class StubSpoonacular(ThreadingHTTPServer):
+    """Serves /{id}/information and /informationBulk, recording requests, connections and concurrency."""
+
+    daemon_threads = True
+
+    def __init__(self, bulk_status: int = 200, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.bulk_status = bulk_status
+        self.delay = delay
+        self.paths = []
+        self.connections = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so pooled connections can be reused
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        with server.lock:
+            server.paths.append(url.path)
+            server.connections.add(self.client_address)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            if url.path.endswith("/informationBulk"):
+                if server.bulk_status != 200:
+                    self.reply(server.bulk_status, None)
+                    return
+                ids = parse_qs(url.query)["ids"][0].split(",")
+                # Spoonacular does not promise the requested order
+                self.reply(200, [{"id": int(i), "title": f"Recipe {i}"} for i in reversed(ids)])
+            else:
+                recipe_id = int(url.path.split("/")[-2])
+                self.reply(200, {"id": recipe_id, "title": f"Recipe {recipe_id}"})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def reply(self, status: int, body):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    servers = []
+
+    def start(**kwargs):
+        server = StubSpoonacular(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        monkeypatch.setenv("SPOONACULAR_API_KEY", "test")
+        monkeypatch.setenv("SPOONACULAR_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/recipes")
+        monkeypatch.delenv("RECIPE_CORPUS", raising=False)
+        monkeypatch.delenv("RECIPE_OFFLINE", raising=False)
+        return server, RecipeAgent()
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def titles(recipes):
+    return [recipe.get("title") for recipe in recipes]
+
+def test_bulk_fetch_returns_recipes_in_request_order(stub):
+    server, agent = stub()
+
+    assert titles(agent.get_recipes_details([3, 1, 2])) == ["Recipe 3", "Recipe 1", "Recipe 2"]
+    assert server.paths == ["/recipes/informationBulk"]
+
+    # Every recipe of the bulk response is now cached
+    assert titles(agent.get_recipes_details([1, 2, 3])) == ["Recipe 1", "Recipe 2", "Recipe 3"]
+    assert len(server.paths) == 1
+
+@pytest.mark.parametrize("status", [404, 405])
+def test_unsupported_bulk_endpoint_falls_back_to_single_fetches(stub, status):
+    server, agent = stub(bulk_status=status)
+
+    assert titles(agent.get_recipes_details([1, 2])) == ["Recipe 1", "Recipe 2"]
+    assert not agent.bulk_supported
+    assert server.paths[0] == "/recipes/informationBulk"
+    assert sorted(server.paths[1:]) == ["/recipes/1/information", "/recipes/2/information"]
+
+    # The endpoint is not tried again
+    assert titles(agent.get_recipes_details([4])) == ["Recipe 4"]
+    assert server.paths.count("/recipes/informationBulk") == 1
+
+def test_single_fetches_run_concurrently(stub):
+    server, agent = stub(bulk_status=404, delay=0.2)
+    agent.bulk_supported = False
+    ids = list(range(1, 7))
+
+    start = time.perf_counter()
+    results = dict(agent.iter_recipes_details(ids))
+    elapsed = time.perf_counter() - start
+
+    assert titles(results[position] for position in range(len(ids))) == [f"Recipe {i}" for i in ids]
+    assert server.max_in_flight > 1
+    assert elapsed < 0.2 * len(ids) / 2
+
+def test_session_reuses_connections(stub):
+    server, agent = stub()
+
+    for recipe_id in range(1, 6):
+        assert agent.get_recipe_details(recipe_id)["title"] == f"Recipe {recipe_id}"
+
+    assert len(server.paths) == 5
+    assert len(server.connections) == 1
@@ -0,0 +1,56 @@
+import pytest
+
+from keyword_matcher import STOPWORDS, content_words, normalize_token
+from similarity_cache import SimilarityCache, shingles
+
+DIFFERENT_MEANING = [
+    ("is divorce legal in texas", "is divorce legal in ohio"),
+    ("is it legal to own a gun", "is it illegal to own a gun"),
+    ("can i sue my employer", "can i sue my landlord"),
+    ("funny action movie from the 90s", "funny comedy movie from the 90s"),
+    ("can i sue my employer", "can my employer sue me"),
+    ("moving from texas to ohio with my child", "moving to texas from ohio with my child"),
+    ("can i sue you", "can you sue me"),
+    ("can my landlord evict me", "can the landlord evict me"),
+]
+
+SAME_MEANING = [
+    ("can a landlord evict me", "can the landlord evict me"),
+    ("what are the rights of a tenant", "what are rights of a tenant"),
+    ("does this contract need a witness", "does the contract need a witness"),
+]
+
+@pytest.mark.parametrize("stored, query", DIFFERENT_MEANING)
+def test_different_questions_are_not_reused(stored, query):
+    cache = SimilarityCache()
+    cache.add(stored, {"answer": stored})
+    assert cache.lookup(query) is None
+
+@pytest.mark.parametrize("stored, query", SAME_MEANING)
+def test_stopword_variants_are_reused(stored, query):
+    cache = SimilarityCache()
+    cache.add(stored, {"answer": stored})
+    assert cache.lookup(query) == {"answer": stored}
+
+def test_stopword_only_queries_are_not_cached():
+    cache = SimilarityCache()
+    cache.add("what is it", {"answer": "nothing"})
+    assert len(cache) == 0
+    assert cache.lookup("what is this") is None
+
+def test_shingles_skip_function_words_only():
+    assert shingles("is divorce legal in ohio") == {"divorce", "legal", "in", "ohio", "divorce legal",
+                                                    "legal in", "in ohio"}
+
+def test_stopwords_are_normalized_like_tokens():
+    assert all(normalize_token(word) == word for word in STOPWORDS)
+    assert content_words("Does this apply to me?") == ["apply"]
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SimilarityCache(max_entries=2)
+    cache.add("landlord eviction notice", {"answer": 1})
+    cache.add("child custody", {"answer": 2})
+    assert cache.lookup("the landlord eviction notice") == {"answer": 1}
+    cache.add("overtime wages", {"answer": 3})
+    assert cache.lookup("child custody") is None
+    assert cache.lookup("landlord eviction notice") == {"answer": 1}
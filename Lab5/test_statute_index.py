@@ -0,0 +1,47 @@
+import json
+
+from statute_index import StatuteIndex, build_statute_index, terms
+
+PASSAGES = [
+    {"id": "p1", "name": "Residential Tenancies Act s. 12", "citation": "RTA 12", "practice_area": "property",
+     "text": "A landlord may end a lease by eviction only after written notice."},
+    {"id": "p2", "name": "Employment Standards Act s. 4", "citation": "ESA 4", "practice_area": "employment",
+     "text": "This section sets the minimum wage and does not apply to contractors."},
+    {"id": "p3", "name": "Family Law Act s. 7", "citation": "FLA 7", "practice_area": "family",
+     "text": "Custody of a child is decided in the best interests of the child."},
+]
+
+def build(tmp_path):
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text("\n".join(json.dumps(p) for p in PASSAGES) + "\n")
+    build_statute_index(str(corpus), str(tmp_path / "index"))
+    return StatuteIndex(str(tmp_path / "index"))
+
+def test_normalized_stopwords_are_not_indexed(tmp_path):
+    index = build(tmp_path)
+    assert terms("Does this lease allow eviction?") == ["lease", "allow", "eviction"]
+    assert "thi" not in index.term_table
+    assert "doe" not in index.term_table
+
+def test_stopwords_do_not_dilute_coverage(tmp_path):
+    index = build(tmp_path)
+
+    hits = index.search("Does this lease end by eviction?", k=3)
+
+    assert hits[0]["passage"]["id"] == "p1"
+    assert hits[0]["coverage"] == 1.0
+    assert StatuteIndex.confident(hits)
+
+def test_practice_area_filter(tmp_path):
+    index = build(tmp_path)
+
+    assert index.search("does this apply to the minimum wage", practice_areas=["family"]) == []
+    assert index.search("does this apply to the minimum wage", practice_areas=["employment"])[0]["passage"]["id"] == "p2"
+
+def test_fingerprint_changes_with_the_corpus(tmp_path):
+    before = build(tmp_path).fingerprint
+    PASSAGES.append({"id": "p4", "text": "Zoning bylaws limit building height.", "practice_area": "property"})
+    try:
+        assert build(tmp_path).fingerprint != before
+    finally:
+        PASSAGES.pop()
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from chromatic import chromatic_number
+from dsatur import solve_map_coloring_dsatur
+from map_search import solve_map_coloring_iterative
+from mapColor import solve_map_coloring
+from nQueen import count_n_queens, first_n_queens_solution, min_conflicts_n_queens
+
+# Batch runner for the Lab7 solvers. Instances are streamed from DIMACS
+# .col files and JSON-lines files, solved on a process pool and written to a
+# JSONL report (one line per instance, in completion order).
+#
+# JSON-lines instances look like:
+#   {"id": "m1", "problem": "map_coloring", "graph": {"0": [1], "1": [0]}, "num_colors": 2}
+#   {"id": "m2", "problem": "map_coloring", "n": 3, "edges": [[0, 1], [1, 2]], "solver": "chromatic"}
+#   {"id": "q1", "problem": "n_queens", "n": 12, "mode": "count"}
+#
+# Map-coloring solvers: "backtracking", "dsatur", "iterative", "chromatic"
+# (used when num_colors is missing). N-Queens modes: "count", "first",
+# "min_conflicts".
+
+def read_dimacs(path):
+    """Read a DIMACS .col file ("p edge N M" / "e u v", 1-based) into a graph dict."""
+    graph = {}
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if not parts or parts[0] == "c":
+                continue
+            if parts[0] == "p":
+                graph = {i: [] for i in range(int(parts[2]))}
+            elif parts[0] == "e":
+                u, v = int(parts[1]) - 1, int(parts[2]) - 1
+                graph[u].append(v)
+                graph[v].append(u)
+    return graph
+
+def _graph_from_record(record):
+    if "graph" in record:
+        return {int(node): [int(v) for v in neighbors] for node, neighbors in record["graph"].items()}
+    graph = {i: [] for i in range(record["n"])}
+    for u, v in record.get("edges", []):
+        graph[u].append(v)
+        graph[v].append(u)
+    return graph
+
+def _error_record(instance_id, error):
+    # Reported like a failed solve instead of aborting the whole batch
+    return {"id": instance_id, "error": f"{type(error).__name__}: {error}"}
+
+def _instance_from_line(line, line_id, num_colors, solver):
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise TypeError(f"expected a JSON object, got {type(record).__name__}")
+    record.setdefault("id", line_id)
+    if record.get("problem", "map_coloring") == "map_coloring":
+        record["problem"] = "map_coloring"
+        record["graph"] = _graph_from_record(record)
+        record.setdefault("num_colors", num_colors)
+        if solver and not record.get("solver"):
+            record["solver"] = solver
+    return record
+
+def iter_instances(paths, num_colors=None, solver=None):
+    """
+    Yield instance dicts from .col and JSON-lines files without loading them
+    all at once. A file or line that cannot be read into an instance yields
+    {"id", "error"} instead, so one bad record does not stop the batch.
+    """
+    for path in paths:
+        if path.endswith(".col"):
+            try:
+                graph = read_dimacs(path)
+            except (OSError, ValueError, IndexError, KeyError) as e:
+                yield _error_record(os.path.basename(path), e)
+                continue
+            yield {
+                "id": os.path.basename(path),
+                "problem": "map_coloring",
+                "graph": graph,
+                "num_colors": num_colors,
+                "solver": solver,
+            }
+            continue
+        with open(path) as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                line_id = f"{os.path.basename(path)}:{line_number}"
+                try:
+                    instance = _instance_from_line(line, line_id, num_colors, solver)
+                except (ValueError, TypeError, KeyError, AttributeError, IndexError) as e:
+                    # json.JSONDecodeError is a ValueError
+                    instance = _error_record(line_id, e)
+                yield instance
+
+def _solve_map_coloring(instance):
+    graph = instance["graph"]
+    num_colors = instance.get("num_colors")
+    solver = instance.get("solver") or ("dsatur" if num_colors else "chromatic")
+    result = {"nodes": len(graph), "solver": solver}
+
+    if solver == "chromatic":
+        k, colors, stats = chromatic_number(graph)
+        result.update(num_colors=k, colors=colors, lower_bound=stats["lower_bound"], upper_bound=stats["upper_bound"])
+    elif solver == "dsatur":
+        colors, stats = solve_map_coloring_dsatur(graph, num_colors)
+        result.update(num_colors=num_colors, colors=colors, backtracks=stats["backtracks"])
+    elif solver == "iterative":
+        colors, status, stats = solve_map_coloring_iterative(graph, num_colors, time_limit=instance.get("time_limit"))
+        result.update(num_colors=num_colors, colors=colors, status=status, backtracks=stats["backtracks"])
+    elif solver == "backtracking":
+        if len(graph) > sys.getrecursionlimit() - 100:
+            sys.setrecursionlimit(len(graph) + 1000)
+        colors = solve_map_coloring(graph, num_colors)
+        result.update(num_colors=num_colors, colors=colors)
+    else:
+        raise ValueError(f"Unknown map-coloring solver: {solver}")
+    result["solved"] = result["colors"] is not None
+    return result
+
+def _solve_n_queens(instance):
+    n = instance["n"]
+    mode = instance.get("mode", "count")
+    if mode == "count":
+        return {"n": n, "mode": mode, "solutions": count_n_queens(n)}
+    if mode == "first":
+        solution = first_n_queens_solution(n)
+        return {"n": n, "mode": mode, "columns": list(solution) if solution else None}
+    if mode == "min_conflicts":
+        solution = min_conflicts_n_queens(n, seed=instance.get("seed"))
+        return {"n": n, "mode": mode, "columns": list(solution) if solution else None}
+    raise ValueError(f"Unknown N-Queens mode: {mode}")
+
+def solve_instance(instance):
+    """Solve one instance and return its report line (never raises)."""
+    report = {"id": instance.get("id"), "problem": instance.get("problem")}
+    if "error" in instance:
+        # Unreadable input line from iter_instances
+        report["error"] = instance["error"]
+        return report
+    start = time.perf_counter()
+    try:
+        if instance["problem"] == "map_coloring":
+            report.update(_solve_map_coloring(instance))
+        elif instance["problem"] == "n_queens":
+            report.update(_solve_n_queens(instance))
+        else:
+            raise ValueError(f"Unknown problem: {instance['problem']}")
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+def run_batch(paths, report_path, workers=None, num_colors=None, solver=None):
+    """Solve every instance in `paths` on a worker pool, writing one JSONL line per result."""
+    instances = iter_instances(paths, num_colors=num_colors, solver=solver)
+    count = 0
+    with open(report_path, "w") as report, Pool(workers) as pool:
+        for result in pool.imap_unordered(solve_instance, instances):
+            report.write(json.dumps(result) + "\n")
+            report.flush()
+            count += 1
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve map-coloring and N-Queens instances in bulk.")
+    parser.add_argument("inputs", nargs="+", help="DIMACS .col files and/or JSON-lines instance files")
+    parser.add_argument("-o", "--output", default="report.jsonl", help="JSONL report path")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("-k", "--num-colors", type=int, default=None,
+                        help="colors for map-coloring instances that do not set one (default: find the minimum)")
+    parser.add_argument("-s", "--solver", choices=["backtracking", "dsatur", "iterative", "chromatic"], default=None)
+    args = parser.parse_args()
+
+    count = run_batch(args.inputs, args.output, workers=args.workers, num_colors=args.num_colors, solver=args.solver)
+    print(f"Solved {count} instances, report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
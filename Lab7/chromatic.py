@@ -0,0 +1,86 @@
+from dsatur import NogoodStore, solve_map_coloring_dsatur, symmetric_adjacency
+
+def greedy_dsatur_coloring(graph):
+    """
+    One pass of DSATUR without backtracking: repeatedly color the node with
+    the most distinct neighbor colors using the smallest free color.
+
+    Returns:
+        list: A valid coloring (colors 1..k); k is an upper bound on the
+              chromatic number.
+    """
+    adjacency = symmetric_adjacency(graph)
+    n = len(adjacency)
+    colors = [0] * n
+    neighbor_colors = [set() for _ in range(n)]
+    uncolored = set(range(n))
+
+    while uncolored:
+        node = max(uncolored, key=lambda v: (len(neighbor_colors[v]), len(adjacency[v])))
+        color = 1
+        while color in neighbor_colors[node]:
+            color += 1
+        colors[node] = color
+        uncolored.discard(node)
+        for neighbor in adjacency[node]:
+            neighbor_colors[neighbor].add(color)
+    return colors
+
+def greedy_clique(graph):
+    """
+    Grow a clique greedily from every node, always adding the candidate with
+    the most neighbors among the remaining candidates. Any clique is a lower
+    bound on the chromatic number.
+
+    Returns:
+        list: Nodes of the largest clique found.
+    """
+    adjacency = symmetric_adjacency(graph)
+    best = []
+    for start in sorted(range(len(adjacency)), key=lambda v: -len(adjacency[v])):
+        if len(adjacency[start]) < len(best):
+            break
+        clique = [start]
+        candidates = set(adjacency[start])
+        while candidates:
+            node = max(candidates, key=lambda v: len(adjacency[v] & candidates))
+            clique.append(node)
+            candidates &= adjacency[node]
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+def chromatic_number(graph):
+    """
+    Find the minimum number of colors for the map.
+
+    A greedy DSATUR coloring gives the upper bound and a greedy clique the
+    lower bound; the exact solver then tries k = upper - 1, upper - 2, ...
+    until a k fails or the bounds meet. Going downwards lets every no-good
+    learned at a larger k be reused at the smaller ones.
+
+    Returns:
+        tuple: (k, colors, stats) where colors is an optimal coloring and
+               stats records the bounds and the solver work for each k.
+    """
+    if not graph:
+        return 0, [], {"lower_bound": 0, "upper_bound": 0, "runs": [], "nogoods": 0}
+
+    best_colors = greedy_dsatur_coloring(graph)
+    upper = max(best_colors)
+    lower = max(1, len(greedy_clique(graph)))
+    stats = {"lower_bound": lower, "upper_bound": upper, "runs": []}
+
+    nogoods = NogoodStore()
+    k = upper - 1
+    while k >= lower:
+        colors, run_stats = solve_map_coloring_dsatur(graph, k, nogoods=nogoods)
+        stats["runs"].append({"k": k, "colorable": colors is not None, **run_stats})
+        if colors is None:
+            break
+        best_colors = colors
+        upper = max(colors)  # the solver may use fewer than k colors
+        k = upper - 1
+
+    stats["nogoods"] = len(nogoods)
+    return upper, best_colors, stats
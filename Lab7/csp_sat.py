@@ -0,0 +1,161 @@
+import random
+import time
+
+from dsatur import solve_map_coloring_dsatur, symmetric_adjacency
+from nQueen import first_n_queens_solution
+from sat_solver import CDCLSolver
+
+# CNF encodings of the Lab7 CSPs for the CDCL solver in sat_solver.py, plus a
+# side-by-side comparison with the backtracking solvers.
+
+def _exactly_one(variables):
+    clauses = [list(variables)]
+    clauses.extend(_at_most_one(variables))
+    return clauses
+
+def _at_most_one(variables):
+    return [[-a, -b] for i, a in enumerate(variables) for b in variables[i + 1:]]
+
+def encode_map_coloring(graph, num_colors):
+    """
+    Variable node * num_colors + c (c = 1..num_colors) is true when the node
+    gets color c.
+
+    Returns:
+        tuple: (num_vars, clauses)
+    """
+    adjacency = symmetric_adjacency(graph)
+    n = len(adjacency)
+
+    def var(node, color):
+        return node * num_colors + color
+
+    clauses = []
+    for node in range(n):
+        clauses.extend(_exactly_one([var(node, c) for c in range(1, num_colors + 1)]))
+    for node in range(n):
+        for neighbor in adjacency[node]:
+            if node < neighbor:
+                clauses.extend([-var(node, c), -var(neighbor, c)] for c in range(1, num_colors + 1))
+    return n * num_colors, clauses
+
+def decode_map_coloring(model, n, num_colors):
+    """Turn a model into the colors list solve_map_coloring returns."""
+    return [next(c for c in range(1, num_colors + 1) if model[node * num_colors + c]) for node in range(n)]
+
+def encode_n_queens(n):
+    """
+    Variable row * n + col + 1 is true when a queen stands on (row, col).
+
+    Returns:
+        tuple: (num_vars, clauses)
+    """
+    def var(row, col):
+        return row * n + col + 1
+
+    clauses = []
+    for row in range(n):
+        clauses.extend(_exactly_one([var(row, col) for col in range(n)]))
+    for col in range(n):
+        clauses.extend(_at_most_one([var(row, col) for row in range(n)]))
+    for d in range(-(n - 1), n):
+        clauses.extend(_at_most_one([var(row, row - d) for row in range(n) if 0 <= row - d < n]))
+    for s in range(2 * n - 1):
+        clauses.extend(_at_most_one([var(row, s - row) for row in range(n) if 0 <= s - row < n]))
+    return n * n, clauses
+
+def decode_n_queens(model, n):
+    """Turn a model into a tuple of columns, one per row."""
+    return tuple(next(col for col in range(n) if model[row * n + col + 1]) for row in range(n))
+
+def solve_cnf(num_vars, clauses, max_conflicts=None):
+    """Returns (model or None, solver stats)."""
+    solver = CDCLSolver(num_vars)
+    for clause in clauses:
+        if not solver.add_clause(clause):
+            break
+    return solver.solve(max_conflicts=max_conflicts), solver.stats
+
+def solve_map_coloring_sat(graph, num_colors):
+    """Returns (colors or None, stats), like solve_map_coloring_dsatur."""
+    num_vars, clauses = encode_map_coloring(graph, num_colors)
+    model, stats = solve_cnf(num_vars, clauses)
+    if model is None:
+        return None, stats
+    return decode_map_coloring(model, len(graph), num_colors), stats
+
+def solve_n_queens_sat(n):
+    """Returns (columns or None, stats)."""
+    num_vars, clauses = encode_n_queens(n)
+    model, stats = solve_cnf(num_vars, clauses)
+    if model is None:
+        return None, stats
+    return decode_n_queens(model, n), stats
+
+def random_coloring_instance(n, average_degree=4.6, seed=None):
+    """
+    Random graph with the given average degree. For 3-coloring the
+    satisfiable/unsatisfiable phase transition sits near degree 4.6-4.7,
+    where instances are hardest.
+    """
+    rng = random.Random(seed)
+    graph = {i: [] for i in range(n)}
+    edges = set()
+    target = min(int(average_degree * n / 2), n * (n - 1) // 2)
+    while len(edges) < target:
+        u, v = rng.sample(range(n), 2)
+        edges.add((min(u, v), max(u, v)))
+    for u, v in edges:
+        graph[u].append(v)
+        graph[v].append(u)
+    return graph
+
+def compare_map_coloring(graph, num_colors):
+    """Run the CDCL and the DSATUR backtracking solver on one instance."""
+    start = time.perf_counter()
+    sat_colors, sat_stats = solve_map_coloring_sat(graph, num_colors)
+    sat_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bt_colors, bt_stats = solve_map_coloring_dsatur(graph, num_colors)
+    bt_seconds = time.perf_counter() - start
+
+    if (sat_colors is None) != (bt_colors is None):
+        raise RuntimeError("CDCL and backtracking solvers disagree")
+    return {
+        "colorable": sat_colors is not None,
+        "cdcl": {**sat_stats, "seconds": sat_seconds},
+        "backtracking": {**bt_stats, "seconds": bt_seconds},
+    }
+
+def compare_n_queens(n):
+    """Run the CDCL and the bitmask backtracking solver for the first solution."""
+    start = time.perf_counter()
+    sat_solution, sat_stats = solve_n_queens_sat(n)
+    sat_seconds = time.perf_counter() - start
+
+    bt_stats = {}
+    start = time.perf_counter()
+    bt_solution = first_n_queens_solution(n, bt_stats)
+    bt_seconds = time.perf_counter() - start
+
+    return {
+        "solvable": sat_solution is not None,
+        "cdcl": {**sat_stats, "seconds": sat_seconds},
+        "backtracking": {**bt_stats, "seconds": bt_seconds, "solvable": bt_solution is not None},
+    }
+
+if __name__ == "__main__":
+    for n in (50, 100, 150):
+        for seed in range(3):
+            result = compare_map_coloring(random_coloring_instance(n, 4.6, seed), 3)
+            cdcl, bt = result["cdcl"], result["backtracking"]
+            print(f"n={n} seed={seed} colorable={result['colorable']}: "
+                  f"CDCL conflicts={cdcl['conflicts']} propagations={cdcl['propagations']} ({cdcl['seconds']:.2f}s) | "
+                  f"backtracking nodes={bt['nodes']} backtracks={bt['backtracks']} ({bt['seconds']:.2f}s)")
+    for n in (8, 16, 24):
+        result = compare_n_queens(n)
+        cdcl, bt = result["cdcl"], result["backtracking"]
+        print(f"N-Queens n={n}: CDCL conflicts={cdcl['conflicts']} propagations={cdcl['propagations']} "
+              f"({cdcl['seconds']:.2f}s) | backtracking nodes={bt['nodes']} backtracks={bt['backtracks']} "
+              f"({bt['seconds']:.2f}s)")
@@ -0,0 +1,162 @@
+# Map coloring with DSATUR ordering, forward checking and conflict-directed
+# backjumping (FC-CBJ). Each node's remaining colors are kept as a bitset:
+# bit c-1 set means color c is still allowed.
+
+def symmetric_adjacency(graph):
+    """Adjacency sets for nodes 0..n-1, with every edge in both directions and no self-loops."""
+    adjacency = [set() for _ in range(len(graph))]
+    for node, neighbors in graph.items():
+        for neighbor in neighbors:
+            if neighbor != node:
+                adjacency[node].add(neighbor)
+                adjacency[neighbor].add(node)
+    return adjacency
+
+class NogoodStore:
+    """
+    Learned no-goods: sets of (node, color) assignments that cannot all hold
+    in any coloring. A no-good learned with k colors stays valid for every
+    smaller k, so one store can be shared across a descending search over k.
+    """
+
+    def __init__(self, max_size=4):
+        self.max_size = max_size
+        self.nogoods = set()
+        self.by_literal = {}
+
+    def add(self, literals):
+        literals = frozenset(literals)
+        if len(literals) > self.max_size or literals in self.nogoods:
+            return
+        self.nogoods.add(literals)
+        for literal in literals:
+            self.by_literal.setdefault(literal, []).append(literals)
+
+    def violated(self, node, color, colors):
+        """Return a no-good completed by coloring node with color, if any."""
+        for nogood in self.by_literal.get((node, color), ()):
+            if all(colors[u] == c for u, c in nogood):
+                return nogood
+        return None
+
+    def __len__(self):
+        return len(self.nogoods)
+
+def solve_map_coloring_dsatur(graph, num_colors, nogoods=None):
+    """
+    Color the map with forward checking, DSATUR ordering and backjumping.
+
+    Args:
+        graph (dict): Adjacency list {node: [neighbors]} for nodes 0..n-1.
+        num_colors (int): Number of colors available.
+        nogoods (NogoodStore): Optional store that is both checked during the
+                               search and extended with every dead end found.
+
+    Returns:
+        tuple: (colors, stats). colors is the same list solve_map_coloring
+               returns (color 1..num_colors per node) or None if no coloring
+               exists; stats counts nodes, backtracks and backjumps.
+    """
+    n = len(graph)
+    adjacency = symmetric_adjacency(graph)
+    colors = [0] * n
+    domains = [(1 << num_colors) - 1] * n
+    depth = [-1] * n
+    pruned_by = [[] for _ in range(n)]  # assigned nodes that removed a color from this node
+    conflicts = [set() for _ in range(n)]
+    stats = {"nodes": 0, "backtracks": 0, "backjumps": 0, "nogood_hits": 0}
+    uncolored = set(range(n))
+    free_degree = [len(neighbors) for neighbors in adjacency]  # uncolored neighbors
+    domain_sizes = [num_colors] * n
+
+    def pick_node():
+        # Fewest colors left first, then most uncolored neighbors
+        return min(uncolored, key=lambda v: (domain_sizes[v], -free_degree[v]))
+
+    def set_colored(node, colored):
+        step = -1 if colored else 1
+        for neighbor in adjacency[node]:
+            free_degree[neighbor] += step
+
+    def forward_check(node, bit, removed):
+        for neighbor in adjacency[node]:
+            if not colors[neighbor] and domains[neighbor] & bit:
+                domains[neighbor] &= ~bit
+                domain_sizes[neighbor] -= 1
+                pruned_by[neighbor].append(node)
+                removed.append(neighbor)
+                if not domains[neighbor]:
+                    return neighbor
+        return None
+
+    def undo(bit, removed):
+        for neighbor in removed:
+            domains[neighbor] |= bit
+            domain_sizes[neighbor] += 1
+            pruned_by[neighbor].pop()
+
+    def search(level):
+        # Returns True on success, otherwise the node to jump back to (-1: unsatisfiable)
+        if not uncolored:
+            return True
+        node = pick_node()
+        uncolored.discard(node)
+        set_colored(node, True)
+        depth[node] = level
+        conflicts[node] = set()
+
+        jump = None
+        remaining = domains[node]
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            colors[node] = bit.bit_length()
+            stats["nodes"] += 1
+
+            if nogoods is not None:
+                nogood = nogoods.violated(node, colors[node], colors)
+                if nogood is not None:
+                    stats["nogood_hits"] += 1
+                    stats["backtracks"] += 1
+                    conflicts[node].update(u for u, _ in nogood if u != node)
+                    continue
+
+            removed = []
+            wiped_out = forward_check(node, bit, removed)
+            if wiped_out is None:
+                result = search(level + 1)
+                if result is True:
+                    return True
+                undo(bit, removed)
+                if result != node:
+                    jump = result
+                    break
+            else:
+                undo(bit, removed)
+                conflicts[node].update(pruned_by[wiped_out])
+            stats["backtracks"] += 1
+
+        colors[node] = 0
+        depth[node] = -1
+        uncolored.add(node)
+        set_colored(node, False)
+        if jump is not None:
+            return jump
+
+        # Jump to the deepest node responsible for the dead end
+        conflict_set = (conflicts[node] | set(pruned_by[node])) - {node}
+        if nogoods is not None:
+            nogoods.add((u, colors[u]) for u in conflict_set)
+        if not conflict_set:
+            return -1
+        target = max(conflict_set, key=lambda v: depth[v])
+        conflicts[target] |= conflict_set - {target}
+        if depth[target] < level - 1:
+            stats["backjumps"] += 1
+        return target
+
+    if n == 0:
+        return [], stats
+    if search(0) is not True:
+        return None, stats
+    return colors, stats
@@ -1,3 +1,5 @@
+from chromatic import chromatic_number
+
 # Function to check if coloring is safe
 def is_safe(node, color, colors, graph):
     for neighbor in graph[node]:
@@ -29,29 +31,32 @@ def solve_map_coloring(graph, num_colors):
 
     return colors
 
-num_nodes = int(input("Enter the number of nodes (regions): "))
-
-graph = {}
-print("Enter the adjacency list (space-separated neighbors, one line per node):")
-for i in range(num_nodes):
-    neighbors = list(map(int, input(f"Node {i} neighbors: ").split()))
-    graph[i] = neighbors
-
-num_colors = int(input("Enter the number of colors available: "))
-
-# Example Graph (Adjacency List Representation)
-# graph = {
-#     0: [1, 2, 3],
-#     1: [0, 2],
-#     2: [0, 1, 3],
-#     3: [0, 2]
-# }
-
-num_colors = 3  # Number of colors available
-
-# Solve the problem
-solution = solve_map_coloring(graph, num_colors)
-
-# Print solution
-if solution:
-    print("Coloring of the map:", solution)
\ No newline at end of file
+if __name__ == "__main__":
+    num_nodes = int(input("Enter the number of nodes (regions): "))
+
+    graph = {}
+    print("Enter the adjacency list (space-separated neighbors, one line per node):")
+    for i in range(num_nodes):
+        neighbors = list(map(int, input(f"Node {i} neighbors: ").split()))
+        graph[i] = neighbors
+
+    num_colors = int(input("Enter the number of colors available (0 to find the minimum): "))
+
+    # Example Graph (Adjacency List Representation)
+    # graph = {
+    #     0: [1, 2, 3],
+    #     1: [0, 2],
+    #     2: [0, 1, 3],
+    #     3: [0, 2]
+    # }
+
+    # Solve the problem
+    if num_colors > 0:
+        solution = solve_map_coloring(graph, num_colors)
+    else:
+        num_colors, solution, _ = chromatic_number(graph)
+        print("Minimum number of colors:", num_colors)
+
+    # Print solution
+    if solution:
+        print("Coloring of the map:", solution)
\ No newline at end of file
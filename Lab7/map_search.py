@@ -0,0 +1,181 @@
+import heapq
+import time
+from array import array
+
+# Recursion-free map-coloring search for graphs with many thousands of
+# regions. Adjacency is converted once into CSR form (neighbors of node v are
+# indices[indptr[v]:indptr[v + 1]]) and every per-node value lives in a
+# compact array: domains as color bitsets, colors, domain sizes.
+
+SOLVED = "solved"
+INFEASIBLE = "infeasible"
+BUDGET_EXHAUSTED = "budget exhausted"
+
+def to_csr(graph):
+    """
+    Convert an adjacency-list dict into CSR arrays.
+
+    Edges are made symmetric, duplicates and self-loops are dropped.
+
+    Returns:
+        tuple: (indptr, indices) as array('l') objects.
+    """
+    n = len(graph)
+    neighbor_sets = [set() for _ in range(n)]
+    for node, neighbors in graph.items():
+        for neighbor in neighbors:
+            if neighbor != node:
+                neighbor_sets[node].add(neighbor)
+                neighbor_sets[neighbor].add(node)
+
+    indptr = array('l', [0]) * (n + 1)
+    indices = array('l')
+    for node in range(n):
+        indices.extend(sorted(neighbor_sets[node]))
+        indptr[node + 1] = len(indices)
+    return indptr, indices
+
+class ColoringSearch:
+    """
+    Explicit-stack backtracking with forward checking and DSATUR-style
+    ordering (fewest colors left, then highest degree).
+
+    The whole search state lives on the object, so run() can be called with a
+    time or node budget and called again later to resume where it stopped:
+
+        search = ColoringSearch(graph, 4)
+        while search.run(time_limit=1.0) == BUDGET_EXHAUSTED:
+            print(search.stats)
+    """
+
+    def __init__(self, graph, num_colors):
+        if not 1 <= num_colors <= 64:
+            raise ValueError("num_colors must be between 1 and 64")
+        self.n = len(graph)
+        self.num_colors = num_colors
+        self.indptr, self.indices = to_csr(graph)
+
+        self.colors = array('H', [0]) * self.n
+        self.domains = array('Q', [(1 << num_colors) - 1]) * self.n
+        self.sizes = array('H', [num_colors]) * self.n
+        self.degrees = array('l', (self.indptr[v + 1] - self.indptr[v] for v in range(self.n)))
+
+        self.trail = array('l')  # neighbors whose domain lost the current color of a stack frame
+        self.stack = []  # frames: [node, untried colors bitset, trail length on entry]
+        self.heap = [(num_colors, -self.degrees[v], v) for v in range(self.n)]
+        heapq.heapify(self.heap)
+        self.need_node = True
+        self.status = None
+        self.stats = {"nodes": 0, "backtracks": 0, "max_depth": 0, "elapsed": 0.0}
+
+    def _select_node(self):
+        # Lazy heap: entries go stale when a node is colored or its domain changes
+        heap = self.heap
+        while heap:
+            size, _, node = heapq.heappop(heap)
+            if not self.colors[node] and self.sizes[node] == size:
+                return node
+        return None
+
+    def _undo(self, frame):
+        node, _, trail_start = frame
+        if not self.colors[node]:
+            return
+        bit = 1 << (self.colors[node] - 1)
+        trail = self.trail
+        for i in range(len(trail) - 1, trail_start - 1, -1):
+            neighbor = trail[i]
+            self.domains[neighbor] |= bit
+            self.sizes[neighbor] += 1
+            heapq.heappush(self.heap, (self.sizes[neighbor], -self.degrees[neighbor], neighbor))
+        del trail[trail_start:]
+        self.colors[node] = 0
+
+    def _assign(self, node, bit):
+        # Color node and prune its uncolored neighbors; False on a domain wipe-out
+        self.colors[node] = bit.bit_length()
+        colors, domains, sizes, indices = self.colors, self.domains, self.sizes, self.indices
+        for i in range(self.indptr[node], self.indptr[node + 1]):
+            neighbor = indices[i]
+            if not colors[neighbor] and domains[neighbor] & bit:
+                domains[neighbor] ^= bit
+                sizes[neighbor] -= 1
+                self.trail.append(neighbor)
+                if not sizes[neighbor]:
+                    return False
+                heapq.heappush(self.heap, (sizes[neighbor], -self.degrees[neighbor], neighbor))
+        return True
+
+    def run(self, time_limit=None, node_limit=None):
+        """
+        Search until solved, proven infeasible or out of budget.
+
+        Args:
+            time_limit (float): Seconds to spend in this call.
+            node_limit (int): Color assignments to try in this call.
+
+        Returns:
+            str: SOLVED, INFEASIBLE or BUDGET_EXHAUSTED.
+        """
+        if self.status in (SOLVED, INFEASIBLE):
+            return self.status
+        start = time.perf_counter()
+        deadline = start + time_limit if time_limit is not None else None
+        nodes_left = node_limit if node_limit is not None else -1
+        stack = self.stack
+        steps = 0
+
+        try:
+            while True:
+                if self.need_node:
+                    node = self._select_node()
+                    if node is None:
+                        self.status = SOLVED
+                        return self.status
+                    stack.append([node, self.domains[node], len(self.trail)])
+                    self.need_node = False
+                    if len(stack) > self.stats["max_depth"]:
+                        self.stats["max_depth"] = len(stack)
+
+                frame = stack[-1]
+                self._undo(frame)
+                node, remaining, _ = frame
+                if not remaining:
+                    # Every color failed here: give the node back and retry the parent
+                    stack.pop()
+                    heapq.heappush(self.heap, (self.sizes[node], -self.degrees[node], node))
+                    self.stats["backtracks"] += 1
+                    if not stack:
+                        self.status = INFEASIBLE
+                        return self.status
+                    continue
+
+                if nodes_left == 0:
+                    self.status = BUDGET_EXHAUSTED
+                    return self.status
+                steps += 1
+                if deadline is not None and steps % 1024 == 0 and time.perf_counter() > deadline:
+                    self.status = BUDGET_EXHAUSTED
+                    return self.status
+
+                bit = remaining & -remaining
+                frame[1] = remaining ^ bit
+                nodes_left -= 1
+                self.stats["nodes"] += 1
+                if self._assign(node, bit):
+                    self.need_node = True
+        finally:
+            self.stats["elapsed"] += time.perf_counter() - start
+
+    def solution(self):
+        """The colors list (as solve_map_coloring returns it) once solved, else None."""
+        return list(self.colors) if self.status == SOLVED else None
+
+def solve_map_coloring_iterative(graph, num_colors, time_limit=None, node_limit=None):
+    """
+    Returns:
+        tuple: (colors or None, status, stats)
+    """
+    search = ColoringSearch(graph, num_colors)
+    status = search.run(time_limit=time_limit, node_limit=node_limit)
+    return search.solution(), status, search.stats
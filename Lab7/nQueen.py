@@ -1,43 +1,211 @@
+import random
+from array import array
+
 def print_solution(board, n):
     for row in board:
         print(" ".join("Q" if col else "." for col in row))
     print("\n")
 
-def is_safe(board, row, col, n):
-    # Check column
-    for i in range(row):
-        if board[i][col]:
-            return False
-    
-    # Check upper-left diagonal
-    for i, j in zip(range(row, -1, -1), range(col, -1, -1)):
-        if board[i][j]:
-            return False
-    
-    # Check upper-right diagonal
-    for i, j in zip(range(row, -1, -1), range(col, n)):
-        if board[i][j]:
-            return False
-    
-    return True
+# Bitmask engine: bit c of `cols` is set when column c is taken, and `ld`/`rd`
+# hold the squares attacked in the current row along the two diagonal families.
+# The free squares of a row are one AND/NOT away and are visited lowest bit first.
 
-def solve_n_queens_util(board, row, n):
-    if row == n:
-        print_solution(board, n)
-        return True
-    
-    res = False
-    for col in range(n):
-        if is_safe(board, row, col, n):
-            board[row][col] = 1
-            res = solve_n_queens_util(board, row + 1, n) or res
-            board[row][col] = 0  # Backtrack
-    
-    return res
+def _count_from(n, row, cols, ld, rd):
+    full = (1 << n) - 1
+    last = n - 1
+
+    def count(row, cols, ld, rd):
+        avail = full & ~(cols | ld | rd)
+        if row == last:
+            return 1 if avail else 0
+        total = 0
+        while avail:
+            bit = avail & -avail
+            avail ^= bit
+            total += count(row + 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+        return total
+
+    return count(row, cols, ld, rd)
+
+def count_n_queens(n):
+    """Count all solutions, searching only the left half of the first row."""
+    if n < 1:
+        return 0
+    if n == 1:
+        return 1
+    full = (1 << n) - 1
+    total = 0
+    # Every solution with the first queen in the left half has a mirror image
+    # with it in the right half
+    for col in range(n // 2):
+        bit = 1 << col
+        total += 2 * _count_from(n, 1, bit, (bit << 1) & full, bit >> 1)
+    if n % 2:
+        bit = 1 << (n // 2)
+        total += _count_from(n, 1, bit, (bit << 1) & full, bit >> 1)
+    return total
+
+def _solutions_from(n, row, cols, ld, rd, placed):
+    full = (1 << n) - 1
+    avail = full & ~(cols | ld | rd)
+    while avail:
+        bit = avail & -avail
+        avail ^= bit
+        placed.append(bit.bit_length() - 1)
+        if row == n - 1:
+            yield tuple(placed)
+        else:
+            yield from _solutions_from(n, row + 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1, placed)
+        placed.pop()
+
+def iter_n_queens(n, mirror=True):
+    """
+    Yield every solution as a tuple of column indices, one per row.
+
+    With mirror=True only the left half of the first row is searched and each
+    solution found there is yielded together with its left-right reflection.
+    """
+    if n < 1:
+        return
+    if not mirror or n == 1:
+        yield from _solutions_from(n, 0, 0, 0, 0, [])
+        return
+    full = (1 << n) - 1
+    for col in range(n // 2):
+        bit = 1 << col
+        for solution in _solutions_from(n, 1, bit, (bit << 1) & full, bit >> 1, [col]):
+            yield solution
+            yield tuple(n - 1 - c for c in solution)
+    if n % 2:
+        bit = 1 << (n // 2)
+        yield from _solutions_from(n, 1, bit, (bit << 1) & full, bit >> 1, [n // 2])
+
+def _first_solution_counted(n, stats):
+    # Same search order as _solutions_from, counting placements and undone placements
+    full = (1 << n) - 1
+    placed = []
+
+    def search(row, cols, ld, rd):
+        avail = full & ~(cols | ld | rd)
+        while avail:
+            bit = avail & -avail
+            avail ^= bit
+            stats["nodes"] += 1
+            placed.append(bit.bit_length() - 1)
+            if row == n - 1 or search(row + 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1):
+                return True
+            placed.pop()
+            stats["backtracks"] += 1
+        return False
+
+    return tuple(placed) if search(0, 0, 0, 0) else None
+
+def first_n_queens_solution(n, stats=None):
+    """
+    Return the first solution found as a tuple of columns, or None.
+
+    If a `stats` dict is given, its "nodes" (queens placed) and "backtracks"
+    (placements undone) are set for the search, which then runs a little
+    slower.
+    """
+    if stats is not None:
+        stats.update(nodes=0, backtracks=0)
+        return _first_solution_counted(n, stats) if n > 0 else None
+    return next(_solutions_from(n, 0, 0, 0, 0, []), None) if n > 0 else None
+
+def min_conflicts_n_queens(n, seed=None, max_steps=None):
+    """
+    Find one placement for very large n with min-conflicts local search.
+
+    Queens are kept one per row as a permutation of the columns, so the
+    column counts are always 1 and only the two diagonal families need
+    counters; each counter update is O(1). Rows are first filled greedily
+    with a random unused column that attacks nothing (the last few rows are
+    placed at random), then queens still under attack are repaired by
+    swapping columns with a random row whenever that lowers the conflicts.
+
+    Args:
+        n (int): Board size.
+        seed (int): Seed for reproducible runs.
+        max_steps (int): Repair swaps tried before restarting (default 100*n).
+
+    Returns:
+        array: The column of the queen in each row (empty for n < 1), or None
+               if n has no solution (n = 2 or 3).
+    """
+    if n < 1:
+        return array('i')
+    if n in (2, 3):
+        return None
+    rng_random = random.Random(seed).random
+    offset = n - 1
+    max_steps = max_steps or 100 * n
+
+    while True:
+        cols = array('i', range(n))
+        diag_sum = array('i', bytes(4 * (2 * n - 1)))   # indexed by row + col
+        diag_diff = array('i', bytes(4 * (2 * n - 1)))  # indexed by row - col + n - 1
+
+        random_rows = min(n, 50)
+        for row in range(n):
+            span = n - row
+            tries = span if row < n - random_rows else 1
+            for _ in range(tries):
+                k = row + int(rng_random() * span)
+                col = cols[k]
+                if not diag_sum[row + col] and not diag_diff[row - col + offset]:
+                    break
+            cols[k] = cols[row]
+            cols[row] = col
+            diag_sum[row + col] += 1
+            diag_diff[row - col + offset] += 1
+
+        # Every remaining conflict involves at least one row on this stack
+        conflicted = [row for row in range(n)
+                      if diag_sum[row + cols[row]] > 1 or diag_diff[row - cols[row] + offset] > 1]
+        steps = 0
+        while conflicted and steps < max_steps:
+            i = conflicted[-1]
+            ci = cols[i]
+            if diag_sum[i + ci] == 1 and diag_diff[i - ci + offset] == 1:
+                conflicted.pop()
+                continue
+            steps += 1
+            j = int(rng_random() * n)
+            if j == i:
+                continue
+            cj = cols[j]
+
+            diag_sum[i + ci] -= 1
+            diag_diff[i - ci + offset] -= 1
+            diag_sum[j + cj] -= 1
+            diag_diff[j - cj + offset] -= 1
+            before = diag_sum[i + ci] + diag_diff[i - ci + offset] + diag_sum[j + cj] + diag_diff[j - cj + offset]
+            after = diag_sum[i + cj] + diag_diff[i - cj + offset] + diag_sum[j + ci] + diag_diff[j - ci + offset]
+            if after < before:
+                ci, cj = cj, ci
+                cols[i] = ci
+                cols[j] = cj
+                if diag_sum[j + cj] or diag_diff[j - cj + offset]:
+                    conflicted.append(j)
+            diag_sum[i + ci] += 1
+            diag_diff[i - ci + offset] += 1
+            diag_sum[j + cj] += 1
+            diag_diff[j - cj + offset] += 1
+
+        if not conflicted:
+            return cols
+
+def columns_to_board(columns):
+    n = len(columns)
+    return [[1 if c == col else 0 for c in range(n)] for col in columns]
 
 def solve_n_queens(n):
-    board = [[0] * n for _ in range(n)]
-    if not solve_n_queens_util(board, 0, n):
+    found = False
+    for solution in iter_n_queens(n, mirror=False):
+        print_solution(columns_to_board(solution), n)
+        found = True
+    if not found:
         print("No solution exists")
     
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from nQueen import _count_from, count_n_queens
+
+def enumerate_prefixes(n, prefix_rows):
+    """
+    List every valid placement of the first `prefix_rows` queens.
+
+    Only the left half of the first row is used (plus the middle column when
+    n is odd); each prefix carries the weight its count must be multiplied by
+    to account for the mirrored half.
+
+    Returns:
+        list: (row, cols, ld, rd, weight) tuples ready for _count_from.
+    """
+    full = (1 << n) - 1
+    prefixes = []
+
+    def extend(row, cols, ld, rd, weight):
+        if row == prefix_rows:
+            prefixes.append((row, cols, ld, rd, weight))
+            return
+        avail = full & ~(cols | ld | rd)
+        while avail:
+            bit = avail & -avail
+            avail ^= bit
+            extend(row + 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1, weight)
+
+    for col in range((n + 1) // 2):
+        bit = 1 << col
+        weight = 1 if n % 2 and col == n // 2 else 2
+        extend(1, bit, (bit << 1) & full, bit >> 1, weight)
+    return prefixes
+
+def _count_prefix(task):
+    n, (row, cols, ld, rd, weight) = task
+    return weight * _count_from(n, row, cols, ld, rd)
+
+def parallel_count_n_queens(n, workers=None, prefix_rows=None):
+    """
+    Count N-Queens solutions by farming the subtrees below the first rows'
+    placements out to a process pool.
+
+    Subtrees vary a lot in size, so the prefixes are handed out one at a time
+    from the pool's shared task queue: a worker that finishes a small subtree
+    immediately takes the next one instead of sitting on a fixed share.
+
+    Args:
+        n (int): Board size.
+        workers (int): Number of processes (default: all cores).
+        prefix_rows (int): Rows fixed per task; by default the smallest depth
+                           giving at least 16 tasks per worker.
+    """
+    workers = workers or os.cpu_count() or 1
+    if n < 6:
+        return count_n_queens(n)
+
+    if prefix_rows is None:
+        prefix_rows = 1
+        while prefix_rows < n - 2 and len(enumerate_prefixes(n, prefix_rows)) < 16 * workers:
+            prefix_rows += 1
+    prefix_rows = min(prefix_rows, n - 1)
+
+    tasks = [(n, prefix) for prefix in enumerate_prefixes(n, prefix_rows)]
+    if workers == 1:
+        return sum(map(_count_prefix, tasks))
+    with Pool(workers) as pool:
+        return sum(pool.imap_unordered(_count_prefix, tasks, chunksize=1))
+
+def benchmark(ns, core_counts):
+    """Print the wall time and speedup over the first core count for every n."""
+    for n in ns:
+        baseline = None
+        for cores in core_counts:
+            start = time.perf_counter()
+            total = parallel_count_n_queens(n, workers=cores)
+            elapsed = time.perf_counter() - start
+            if baseline is None:
+                baseline = elapsed
+            print(f"N={n} cores={cores}: {total} solutions in {elapsed:.2f}s, speedup={baseline / elapsed:.2f}x")
+
+if __name__ == "__main__":
+    # Usage: python nqueen_parallel.py [n_min] [n_max]
+    # Each n costs about 5x the previous one on a single core in pure Python:
+    # N=14 takes ~8 s, N=16 a few minutes, N=18 hours and N=20 days, and
+    # every n is timed once per core count.
+    n_min = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    n_max = int(sys.argv[2]) if len(sys.argv) > 2 else 14
+    n_cores = os.cpu_count() or 1
+    core_counts = sorted({1, 2, 4, 8, n_cores} & set(range(1, n_cores + 1)))
+    benchmark(range(n_min, n_max + 1), core_counts)
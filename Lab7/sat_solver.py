@@ -0,0 +1,258 @@
+import heapq
+
+# Pure-Python CDCL SAT solver: two watched literals per clause, VSIDS
+# branching with phase saving, first-UIP clause learning with
+# non-chronological backjumping, and Luby restarts.
+#
+# Literals use the DIMACS convention: variable v is the integer v and its
+# negation is -v; variables are numbered 1..num_vars.
+
+def luby(i):
+    """The i-th element (1-based) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while True:
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+
+class CDCLSolver:
+    """
+    Usage:
+        solver = CDCLSolver(num_vars)
+        solver.add_clause([1, -2])
+        model = solver.solve()      # {var: bool} or None if unsatisfiable
+        solver.stats                # decisions, propagations, conflicts, ...
+    """
+
+    def __init__(self, num_vars, var_decay=0.95, restart_base=100):
+        self.num_vars = num_vars
+        self.var_decay = var_decay
+        self.restart_base = restart_base
+
+        self.clauses = []
+        self.watches = {}  # literal -> clauses watching it (clause[0] or clause[1])
+        self.values = [0] * (num_vars + 1)  # 1 true, -1 false, 0 unassigned
+        self.levels = [0] * (num_vars + 1)
+        self.reasons = [None] * (num_vars + 1)
+        self.saved_phase = [-1] * (num_vars + 1)
+        self.activity = [0.0] * (num_vars + 1)
+        self.var_inc = 1.0
+        self.order = [(0.0, v) for v in range(1, num_vars + 1)]
+
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.ok = True
+        self.stats = {"decisions": 0, "propagations": 0, "conflicts": 0, "restarts": 0, "learned": 0}
+
+    def _value(self, lit):
+        value = self.values[abs(lit)]
+        return value if lit > 0 else -value
+
+    def _enqueue(self, lit, reason):
+        var = abs(lit)
+        self.values[var] = 1 if lit > 0 else -1
+        self.levels[var] = len(self.trail_lim)
+        self.reasons[var] = reason
+        self.trail.append(lit)
+
+    def _watch(self, lit, clause):
+        self.watches.setdefault(lit, []).append(clause)
+
+    def add_clause(self, literals):
+        """Add a clause; returns False once the formula is known unsatisfiable."""
+        if not self.ok:
+            return False
+        self._backjump(0)
+        clause = []
+        for lit in literals:
+            value = self._value(lit)
+            if -lit in clause or value == 1:
+                return True  # tautology or already satisfied at level 0
+            if lit not in clause and value == 0:
+                clause.append(lit)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            value = self._value(clause[0])
+            if value == -1:
+                self.ok = False
+            elif value == 0:
+                self._enqueue(clause[0], None)
+                self.ok = self._propagate() is None
+        else:
+            self.clauses.append(clause)
+            self._watch(clause[0], clause)
+            self._watch(clause[1], clause)
+        return self.ok
+
+    def _propagate(self):
+        """Unit propagation over the trail; returns a conflicting clause or None."""
+        trail = self.trail
+        values = self.values
+        while self.qhead < len(trail):
+            false_lit = -trail[self.qhead]
+            self.qhead += 1
+            self.stats["propagations"] += 1
+            watching = self.watches.get(false_lit)
+            if not watching:
+                continue
+            kept = []
+            i = 0
+            while i < len(watching):
+                clause = watching[i]
+                i += 1
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                first_value = values[abs(first)] if first > 0 else -values[abs(first)]
+                if first_value == 1:
+                    kept.append(clause)
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if (values[abs(lit)] if lit > 0 else -values[abs(lit)]) != -1:
+                        clause[1], clause[k] = lit, false_lit
+                        self._watch(lit, clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if first_value == -1:
+                        kept.extend(watching[i:])
+                        self.watches[false_lit] = kept
+                        return clause
+                    self._enqueue(first, clause)
+            self.watches[false_lit] = kept
+        return None
+
+    def _bump(self, var):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            for v in range(1, self.num_vars + 1):
+                self.activity[v] *= 1e-100
+            self.var_inc *= 1e-100
+            self.order = [(-self.activity[v], v) for v in range(1, self.num_vars + 1)]
+            heapq.heapify(self.order)
+        else:
+            heapq.heappush(self.order, (-self.activity[var], var))
+
+    def _analyze(self, conflict):
+        """First-UIP learning; returns (learned clause, backjump level)."""
+        current_level = len(self.trail_lim)
+        seen = set()
+        learned = [None]
+        pending = 0
+        lit = None
+        index = len(self.trail) - 1
+        clause = conflict
+
+        while True:
+            for q in clause:
+                if lit is not None and q == lit:
+                    continue
+                var = abs(q)
+                if var in seen or self.levels[var] == 0:
+                    continue
+                seen.add(var)
+                self._bump(var)
+                if self.levels[var] == current_level:
+                    pending += 1
+                else:
+                    learned.append(q)
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            lit = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(lit)]
+
+        learned[0] = -lit
+        if len(learned) == 1:
+            return learned, 0
+        # Put the literal from the highest remaining level second so it is watched
+        best = max(range(1, len(learned)), key=lambda i: self.levels[abs(learned[i])])
+        learned[1], learned[best] = learned[best], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def _backjump(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        limit = self.trail_lim[level]
+        for lit in self.trail[limit:]:
+            var = abs(lit)
+            self.saved_phase[var] = self.values[var]
+            self.values[var] = 0
+            self.reasons[var] = None
+            heapq.heappush(self.order, (-self.activity[var], var))
+        del self.trail[limit:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _pick_branch(self):
+        if len(self.order) > 10 * self.num_vars:
+            # Drop the stale entries left behind by bumps and backjumps
+            self.order = [(-self.activity[v], v) for v in range(1, self.num_vars + 1) if self.values[v] == 0]
+            heapq.heapify(self.order)
+        order = self.order
+        while order:
+            _, var = heapq.heappop(order)
+            if self.values[var] == 0:
+                return var if self.saved_phase[var] > 0 else -var
+        return None
+
+    def solve(self, max_conflicts=None):
+        """
+        Returns:
+            dict: {var: bool} model if satisfiable, None if unsatisfiable.
+                  Raises TimeoutError if max_conflicts is reached first.
+        """
+        if not self.ok or self._propagate() is not None:
+            self.ok = False
+            return None
+
+        restart_count = 1
+        conflicts_until_restart = self.restart_base * luby(restart_count)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.stats["conflicts"] += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return None
+                learned, level = self._analyze(conflict)
+                self._backjump(level)
+                if len(learned) == 1:
+                    self._enqueue(learned[0], None)
+                else:
+                    self.clauses.append(learned)
+                    self._watch(learned[0], learned)
+                    self._watch(learned[1], learned)
+                    self._enqueue(learned[0], learned)
+                    self.stats["learned"] += 1
+                self.var_inc /= self.var_decay
+
+                conflicts_until_restart -= 1
+                if max_conflicts is not None and self.stats["conflicts"] >= max_conflicts:
+                    raise TimeoutError("Conflict limit reached")
+                continue
+
+            if conflicts_until_restart <= 0:
+                self.stats["restarts"] += 1
+                restart_count += 1
+                conflicts_until_restart = self.restart_base * luby(restart_count)
+                self._backjump(0)
+                continue
+
+            lit = self._pick_branch()
+            if lit is None:
+                return {v: self.values[v] == 1 for v in range(1, self.num_vars + 1)}
+            self.stats["decisions"] += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(lit, None)
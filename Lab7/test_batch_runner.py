@@ -0,0 +1,45 @@
+import json
+
+from batch_runner import iter_instances, run_batch
+
+LINES = [
+    '{"id": "m1", "problem": "map_coloring", "n": 3, "edges": [[0, 1], [1, 2]], "num_colors": 2}',
+    '{"problem": "map_coloring"}',
+    '[1, 2, 3]',
+    '{not json',
+    '{"id": "m2", "problem": "map_coloring", "n": 2, "edges": [[0, 5]]}',
+    '{"id": "q1", "problem": "n_queens", "n": 6, "mode": "count"}',
+]
+
+def write_inputs(tmp_path):
+    instances = tmp_path / "instances.jsonl"
+    instances.write_text("\n".join(LINES) + "\n")
+    broken = tmp_path / "broken.col"
+    broken.write_text("p edge 2 1\ne 1 7\n")
+    good = tmp_path / "good.col"
+    good.write_text("p edge 3 2\ne 1 2\ne 2 3\n")
+    return [str(instances), str(broken), str(good)]
+
+def test_bad_records_become_error_records(tmp_path):
+    instances = list(iter_instances(write_inputs(tmp_path)))
+
+    errors = {instance["id"]: instance["error"] for instance in instances if "error" in instance}
+    assert errors["instances.jsonl:2"].startswith("KeyError")
+    assert errors["instances.jsonl:3"].startswith("TypeError")
+    assert errors["instances.jsonl:4"].startswith("JSONDecodeError")
+    assert errors["instances.jsonl:5"].startswith("KeyError")
+    assert errors["broken.col"].startswith("KeyError")
+    assert [i["id"] for i in instances if "error" not in i] == ["m1", "q1", "good.col"]
+
+def test_batch_keeps_going_past_bad_records(tmp_path):
+    report_path = tmp_path / "report.jsonl"
+
+    count = run_batch(write_inputs(tmp_path), str(report_path), workers=2)
+
+    with open(report_path) as f:
+        report = {line["id"]: line for line in map(json.loads, f)}
+    assert count == len(report) == 8
+    assert report["m1"]["colors"] is not None and "error" not in report["m1"]
+    assert report["q1"]["solutions"] == 4
+    assert report["good.col"]["num_colors"] == 2
+    assert sum("error" in line for line in report.values()) == 5
@@ -1,76 +1,87 @@
-import random
+import numpy as np
 
 PARAMETER_RANGES = {
-    "M": (20, 100),  
-    "T": (10, 40),  
-    "L": (20, 100),  
-    "F": (10, 20)  
+    "M": (20, 100),
+    "T": (10, 40),
+    "L": (20, 100),
+    "F": (10, 20)
 }
 
+# Per-gene bounds, in the column order of a (pop, 4) population array
+LOWER_BOUNDS = np.array([low for low, _ in PARAMETER_RANGES.values()], dtype=float)
+UPPER_BOUNDS = np.array([high for _, high in PARAMETER_RANGES.values()], dtype=float)
+
 def calculate_strength(params):
-    M, T, L, F = params
+    # Works on one individual or, column-wise, on a whole (pop, 4) population
+    M, T, L, F = np.asarray(params).T
     return (M * 0.8) + (T * 1.5) + (L * 0.2) + (F * 0.5)
 
 def generate_individual():
-    return [
-        random.uniform(PARAMETER_RANGES["M"][0], PARAMETER_RANGES["M"][1]),
-        random.uniform(PARAMETER_RANGES["T"][0], PARAMETER_RANGES["T"][1]),
-        random.uniform(PARAMETER_RANGES["L"][0], PARAMETER_RANGES["L"][1]),
-        random.uniform(PARAMETER_RANGES["F"][0], PARAMETER_RANGES["F"][1]),
-    ]
+    return np.random.uniform(LOWER_BOUNDS, UPPER_BOUNDS)
 
 def generate_population(size):
-    return [generate_individual() for _ in range(size)]
+    return np.random.uniform(LOWER_BOUNDS, UPPER_BOUNDS, (size, len(PARAMETER_RANGES)))
 
 def crossover(parent1, parent2):
-    crossover_point = random.randint(1, len(parent1) - 1)
-    child1 = parent1[:crossover_point] + parent2[crossover_point:]
-    child2 = parent2[:crossover_point] + parent1[crossover_point:]
+    crossover_point = np.random.randint(1, len(parent1))
+    child1 = np.concatenate((parent1[:crossover_point], parent2[crossover_point:]))
+    child2 = np.concatenate((parent2[:crossover_point], parent1[crossover_point:]))
     return child1, child2
 
+def crossover_population(parents1, parents2):
+    # One-point crossover for every pair of rows at once
+    n_genes = parents1.shape[1]
+    crossover_points = np.random.randint(1, n_genes, len(parents1))
+    take_first = np.arange(n_genes) < crossover_points[:, np.newaxis]
+    child1 = np.where(take_first, parents1, parents2)
+    child2 = np.where(take_first, parents2, parents1)
+    return child1, child2
 
-def mutate(individual, mutation_rate=0.1):
-    for i in range(len(individual)):
-        if random.random() < mutation_rate:
-            param_key = list(PARAMETER_RANGES.keys())[i]
-            individual[i] = random.uniform(PARAMETER_RANGES[param_key][0], PARAMETER_RANGES[param_key][1])
+def mutate(individual, mutation_rate=0.1, lower_bounds=LOWER_BOUNDS, upper_bounds=UPPER_BOUNDS):
+    # In place; accepts one individual or a whole population array
+    mask = np.random.random(individual.shape) < mutation_rate
+    individual[mask] = np.random.uniform(lower_bounds, upper_bounds, individual.shape)[mask]
 
 def tournament_selection(population, scores, k=3):
-    selected = random.sample(list(zip(population, scores)), k)
-    selected.sort(key=lambda x: x[1], reverse=True)
-    return selected[0][0]
+    contenders = np.random.randint(0, len(population), k)
+    winner = max(contenders, key=lambda i: scores[i])
+    return population[winner]
 
+def tournament_indices(scores, n, k=3):
+    # Indices of n tournament winners, each drawn from k random contenders
+    contenders = np.random.randint(0, len(scores), (n, k))
+    return contenders[np.arange(n), np.argmax(scores[contenders], axis=1)]
 
-def genetic_algorithm(population_size, generations, mutation_rate=0.1):
-    population = generate_population(population_size)
+def next_generation(population, scores, mutation_rate=0.1, lower_bounds=LOWER_BOUNDS, upper_bounds=UPPER_BOUNDS):
+    scores = np.asarray(scores)
+    n_pairs = (len(population) + 1) // 2
 
-    for generation in range(generations):
-        scores = [calculate_strength(ind) for ind in population]
-        next_generation = []
+    parents1 = population[tournament_indices(scores, n_pairs)]
+    parents2 = population[tournament_indices(scores, n_pairs)]
 
-        while len(next_generation) < population_size:
-       
-            parent1 = tournament_selection(population, scores)
-            parent2 = tournament_selection(population, scores)
+    child1, child2 = crossover_population(parents1, parents2)
+    offspring = np.vstack((child1, child2))[:len(population)]
 
-            child1, child2 = crossover(parent1, parent2)
+    mutate(offspring, mutation_rate, lower_bounds, upper_bounds)
+    return offspring
 
-            mutate(child1, mutation_rate)
-            mutate(child2, mutation_rate)
+def genetic_algorithm(population_size, generations, mutation_rate=0.1, evaluate=calculate_strength):
+    # evaluate(population) -> scores, e.g. a FitnessCache wrapping calculate_strength
+    population = generate_population(population_size)
 
-            next_generation.append(child1)
-            next_generation.append(child2)
+    for generation in range(generations):
+        scores = np.asarray(evaluate(population))
 
-        population = next_generation[:population_size]
+        best_index = np.argmax(scores)
+        print(f"Generation {generation + 1}: Best Strength = {scores[best_index]}, Params = {population[best_index]}")
 
-        best_score = max(scores)
-        best_individual = population[scores.index(best_score)]
-        print(f"Generation {generation + 1}: Best Strength = {best_score}, Params = {best_individual}")
+        population = next_generation(population, scores, mutation_rate)
 
-    scores = [calculate_strength(ind) for ind in population]
-    best_index = scores.index(max(scores))
-    return population[best_index], max(scores)
+    scores = np.asarray(evaluate(population))
+    best_index = np.argmax(scores)
+    return population[best_index], scores[best_index]
 
-best_individual, best_strength = genetic_algorithm(population_size=50, generations=100, mutation_rate=0.1)
-print(f"\nOptimal Rope Parameters: {best_individual}")
-print(f"Maximum Rope Strength: {best_strength}")
\ No newline at end of file
+if __name__ == "__main__":
+    best_individual, best_strength = genetic_algorithm(population_size=50, generations=100, mutation_rate=0.1)
+    print(f"\nOptimal Rope Parameters: {best_individual}")
+    print(f"Maximum Rope Strength: {best_strength}")
\ No newline at end of file
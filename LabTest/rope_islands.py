@@ -0,0 +1,22 @@
+import os
+import sys
+from functools import partial
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Lab4"))
+
+from islands import island_model  # noqa: E402
+from Q2 import calculate_strength, generate_population, next_generation  # noqa: E402
+
+def rope_island_model(mutation_rate=0.1, **kwargs):
+    """Island model using the rope-strength GA operators from Q2 (maximisation)."""
+    return island_model(generate_population, calculate_strength, partial(next_generation, mutation_rate=mutation_rate),
+                        n_dim=4, maximize=True, **kwargs)
+
+if __name__ == "__main__":
+    best_individual, best_strength, stats = rope_island_model(
+        n_islands=4, island_size=50, generations=100, migration_interval=10,
+        migration_size=2, topology="ring", seed=0)
+    print(f"Island bests: {stats['island_best']}")
+    print(f"Evaluations: {stats['evaluations']} in {stats['wall_time']:.2f}s")
+    print(f"\nOptimal Rope Parameters: {best_individual}")
+    print(f"Maximum Rope Strength: {best_strength}")
@@ -0,0 +1,85 @@
+import heapq
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from Q2 import calculate_strength, crossover, generate_individual, mutate, tournament_selection
+
+def steady_state_genetic_algorithm(population_size, evaluations, mutation_rate=0.1, max_workers=None,
+                                   evaluate=calculate_strength, use_processes=True):
+    """
+    Steady-state GA that keeps every worker busy instead of waiting for a
+    whole generation to be scored.
+
+    Each time an evaluation finishes, the child joins the population (replacing
+    the current worst individual once the population is full and the child is
+    better) and a new child is bred from the scored population and submitted,
+    so there is no generation barrier.
+
+    Args:
+        population_size (int): Number of scored individuals kept.
+        evaluations (int): Total number of fitness evaluations to run.
+        mutation_rate (float): Per-gene mutation probability.
+        max_workers (int): Pool size (and number of evaluations in flight).
+        evaluate (callable): Fitness function for one individual; must be
+                             picklable when use_processes is True.
+        use_processes (bool): ProcessPoolExecutor if True, else threads.
+
+    Returns:
+        tuple: (best_individual, best_strength)
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+    population = []
+    scores = []
+    worst_heap = []  # (score, index); the weakest individual sits on top
+    waiting = []  # bred children not yet submitted
+    in_flight = {}
+    submitted = 0
+
+    def next_candidate():
+        # Seed with random individuals until the population has enough to breed from
+        if len(population) + len(in_flight) < population_size or len(population) < 3:
+            return generate_individual()
+        if not waiting:
+            parent1 = tournament_selection(population, scores)
+            parent2 = tournament_selection(population, scores)
+            child1, child2 = crossover(parent1, parent2)
+            mutate(child1, mutation_rate)
+            mutate(child2, mutation_rate)
+            waiting.extend((child1, child2))
+        return waiting.pop()
+
+    with executor_class(max_workers=max_workers) as executor:
+        while submitted < evaluations and len(in_flight) < max_workers:
+            candidate = next_candidate()
+            in_flight[executor.submit(evaluate, candidate)] = candidate
+            submitted += 1
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                candidate = in_flight.pop(future)
+                score = future.result()
+
+                if len(population) < population_size:
+                    heapq.heappush(worst_heap, (score, len(population)))
+                    population.append(candidate)
+                    scores.append(score)
+                elif score > worst_heap[0][0]:
+                    _, index = heapq.heapreplace(worst_heap, (score, worst_heap[0][1]))
+                    population[index] = candidate
+                    scores[index] = score
+
+                if submitted < evaluations:
+                    candidate = next_candidate()
+                    in_flight[executor.submit(evaluate, candidate)] = candidate
+                    submitted += 1
+
+    best_index = scores.index(max(scores))
+    return population[best_index], scores[best_index]
+
+if __name__ == "__main__":
+    best_individual, best_strength = steady_state_genetic_algorithm(population_size=50, evaluations=5000, mutation_rate=0.1)
+    print(f"\nOptimal Rope Parameters: {best_individual}")
+    print(f"Maximum Rope Strength: {best_strength}")